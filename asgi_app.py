@@ -0,0 +1,230 @@
+"""
+ASGI entry point serving the same routes and template as flask_app.py.
+
+Handlers are async, and everything that touches the data file, the database
+or the template runs in a worker thread, so a slow client or an open
+/events stream costs an idle coroutine instead of a whole gunicorn worker.
+Run it under any ASGI server, e.g.:
+
+    pip install uvicorn
+    uvicorn asgi_app:app --workers 2
+"""
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, unquote_plus
+
+from werkzeug.http import parse_etags
+
+import flask_app
+import metrics
+
+# Open /events streams are cheap here, so pages always get live updates
+flask_app.app.config['LIVE_UPDATES'] = True
+
+
+def header(scope, name):
+    """The value of a request header (lowercase bytes name), decoded, or ''."""
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin-1')
+    return ""
+
+
+async def send_response(send, status, body=b"", headers=()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(key.encode('latin-1'), value.encode('latin-1')) for key, value in headers],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, status, data):
+    await send_response(send, status, json.dumps(data).encode('utf-8'),
+                        [('content-type', 'application/json')])
+
+
+async def send_cached(scope, send, body, etag, content_type):
+    """Same caching contract as flask_app.cached_response: strong ETag, 304 when unchanged."""
+    headers = [('etag', f'"{etag}"'), ('cache-control', 'no-cache')]
+    if parse_etags(header(scope, b'if-none-match') or None).contains(etag):
+        await send_response(send, 304, headers=headers)
+    else:
+        await send_response(send, 200, body, headers + [('content-type', content_type)])
+
+
+async def read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get('body', b"")
+        if not message.get('more_body'):
+            return body
+
+
+def render_in_request_context(render):
+    """Wraps a flask_app helper so url_for() works in it."""
+    def render_page(*args, **kwargs):
+        with flask_app.app.test_request_context('/'):
+            return render(*args, **kwargs)
+    return render_page
+
+
+render_index = render_in_request_context(flask_app.render_index)
+
+
+def query_params(scope):
+    return {key: values[-1] for key, values in parse_qs(scope['query_string'].decode('latin-1')).items()}
+
+
+async def read_json(receive):
+    try:
+        return json.loads(await read_body(receive))
+    except ValueError:
+        return None
+
+
+async def index(scope, receive, send, household):
+    body, etag = await asyncio.to_thread(flask_app.cached_page, 'index', render_index, household)
+    await send_cached(scope, send, body, etag, 'text/html; charset=utf-8')
+
+
+async def api_chores(scope, receive, send, household):
+    query = query_params(scope)
+    options = {'assignee': query['assignee']} if 'assignee' in query else {}
+    body, etag = await asyncio.to_thread(
+        flask_app.cached_page, 'api_chores', flask_app.render_api_chores, household, **options)
+    await send_cached(scope, send, body, etag, 'application/json')
+
+
+async def api_completions(scope, receive, send, household):
+    status, result = await asyncio.to_thread(flask_app.complete_batch, await read_json(receive), household)
+    await send_json(send, status, result)
+
+
+async def api_points(scope, receive, send, household):
+    query = query_params(scope)
+    status, result = await asyncio.to_thread(
+        flask_app.points_summary, query.get('period', 'week'), query.get('count', 8), household)
+    await send_json(send, status, result)
+
+
+async def api_households(scope, receive, send, household):
+    payload = await read_json(receive)
+    status, result = await asyncio.to_thread(render_in_request_context(flask_app.create_household), payload)
+    await send_json(send, status, result)
+
+
+async def complete_chore(scope, receive, send, household):
+    await asyncio.to_thread(flask_app.complete_by_name, unquote_plus(scope['route_path'][len('/complete/'):]),
+                            household)
+    location = f"/h/{household.id}/" if household.id else "/"
+    await send_response(send, 302, headers=[('location', location)])
+
+
+async def events(scope, receive, send, household):
+    """Server-sent events, streamed until the client goes away."""
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no')],
+    })
+
+    async def wait_for_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    disconnected = asyncio.ensure_future(wait_for_disconnect())
+    stream = household.live_updates.astream()
+    next_message = None
+    try:
+        while True:
+            next_message = asyncio.ensure_future(stream.__anext__())
+            await asyncio.wait({next_message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                break
+            await send({'type': 'http.response.body', 'body': next_message.result().encode('utf-8'),
+                        'more_body': True})
+    finally:
+        disconnected.cancel()
+        if next_message is not None and not next_message.done():
+            # The generator can only be closed once the pending step has finished unwinding
+            next_message.cancel()
+            await asyncio.gather(next_message, return_exceptions=True)
+        await stream.aclose()
+
+
+async def metrics_endpoint(scope, receive, send, household):
+    await send_response(send, 200, metrics.render().encode('utf-8'), [('content-type', metrics.CONTENT_TYPE)])
+
+
+ROUTES = {
+    ('GET', '/'): index,
+    ('GET', '/api/chores'): api_chores,
+    ('POST', '/api/completions'): api_completions,
+    ('GET', '/api/points'): api_points,
+    ('POST', '/api/households'): api_households,
+    ('GET', '/metrics'): metrics_endpoint,
+    ('GET', '/events'): events,
+}
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await asyncio.to_thread(flask_app.default_household.store.sync)
+            await asyncio.to_thread(flask_app.households.close)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+def without_body(send):
+    """For HEAD requests: pass the headers through, drop the body."""
+    async def send_headers_only(message):
+        if message['type'] == 'http.response.body':
+            message = dict(message, body=b"")
+        await send(message)
+    return send_headers_only
+
+
+def timed(send, route, method):
+    """
+    Records the time until the response starts, like Flask's after_request,
+    so an /events stream counts once rather than for as long as it stays open.
+    """
+    started = time.perf_counter()
+
+    async def send_timed(message):
+        if message['type'] == 'http.response.start':
+            metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, route, method)
+        await send(message)
+    return send_timed
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    path, method = scope['path'], scope['method']
+    if method == 'HEAD':
+        method, send = 'GET', without_body(send)
+    household = flask_app.default_household
+    if path.startswith('/h/'):
+        # /h/<household>/... serves the same routes for one household
+        household_id, _, rest = path[len('/h/'):].partition('/')
+        path = '/' + rest
+        try:
+            household = await asyncio.to_thread(flask_app.households.get, household_id)
+        except KeyError:
+            household = None
+    handler = ROUTES.get((method, path))
+    if handler is None and method == 'GET' and path.startswith('/complete/'):
+        handler = complete_chore
+    top_level_only = (api_households, metrics_endpoint)
+    if handler is None or household is None or (handler in top_level_only and household.id):
+        return await send_response(send, 404, b"Not Found", [('content-type', 'text/plain')])
+    await handler(dict(scope, route_path=path), receive, timed(send, handler.__name__, scope['method']), household)
@@ -0,0 +1,114 @@
+"""
+Concurrent-connection capacity: WSGI (gunicorn sync and threaded workers) vs the ASGI app (uvicorn).
+
+Holds N /events streams open against each server and checks whether a plain
+GET / still answers within the timeout, for growing N. Needs gunicorn and
+uvicorn installed. Run from the repository root:
+    python benchmarks/bench_asgi.py --workers 2 --max-streams 512
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def open_stream(port):
+    """Opens an /events stream and waits for its first message; returns the connection."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await writer.drain()
+    return reader, writer
+
+
+async def get_index(port, timeout):
+    """Time for GET / in ms, or None if it didn't answer within `timeout` seconds."""
+    start = time.perf_counter()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+        writer.write(b"GET / HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        status = await asyncio.wait_for(reader.readline(), timeout)
+        writer.close()
+    except (asyncio.TimeoutError, OSError):
+        return None
+    return (time.perf_counter() - start) * 1e3 if b" 200 " in status else None
+
+
+async def capacity(port, max_streams, timeout):
+    """Doubles the number of open streams until GET / stops answering."""
+    streams, results, count = [], [], 1
+    try:
+        while count <= max_streams:
+            while len(streams) < count:
+                streams.append(await asyncio.wait_for(open_stream(port), timeout))
+            await asyncio.sleep(0.2)
+            latency = await get_index(port, timeout)
+            results.append((count, latency))
+            if latency is None:
+                break
+            count *= 2
+    except (asyncio.TimeoutError, OSError):
+        results.append((count, None))
+    finally:
+        for _, writer in streams:
+            writer.close()
+    return results
+
+
+def wait_for_port(port, timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if asyncio.run(get_index(port, 1)) is not None:
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} didn't come up")
+
+
+def run_server(command, port, data_dir, args):
+    # /events is off by default (it 404s), so turn live updates on for every server
+    env = dict(os.environ, PYTHONPATH=ROOT, CHORE_DATA_FILE=os.path.join(data_dir, 'chore_data.json'),
+               CHORE_LIVE_UPDATES='1')
+    server = subprocess.Popen(command, cwd=data_dir, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        return asyncio.run(capacity(port, args.max_streams, args.timeout))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-streams', type=int, default=512)
+    parser.add_argument('--timeout', type=float, default=2.0)
+    args = parser.parse_args()
+
+    servers = {
+        'WSGI (gunicorn sync)': [shutil.which('gunicorn') or 'gunicorn', '-w', str(args.workers),
+                                 '-b', '127.0.0.1:8701', 'flask_app:app'],
+        'WSGI (gunicorn.conf.py)': [shutil.which('gunicorn') or 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'),
+                                    '-w', str(args.workers), '-b', '127.0.0.1:8703', 'flask_app:app'],
+        'ASGI (uvicorn)': [sys.executable, '-m', 'uvicorn', 'asgi_app:app', '--workers', str(args.workers),
+                           '--port', '8702', '--log-level', 'warning'],
+    }
+    ports = {'WSGI (gunicorn sync)': 8701, 'WSGI (gunicorn.conf.py)': 8703, 'ASGI (uvicorn)': 8702}
+    for name, command in servers.items():
+        with tempfile.TemporaryDirectory() as data_dir:
+            results = run_server(command, ports[name], data_dir, args)
+        served = [count for count, latency in results if latency is not None]
+        print(f"{name}, {args.workers} workers: GET / still served with up to "
+              f"{max(served) if served else 0} open /events streams")
+        for count, latency in results:
+            print(f"  {count:5d} streams: " + (f"{latency:8.1f} ms" if latency is not None else "  timed out"))
+
+
+if __name__ == '__main__':
+    main()
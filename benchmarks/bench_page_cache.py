@@ -0,0 +1,67 @@
+"""
+Load test for the index page: uncached renders vs cache hits vs 304 revalidations.
+
+Run from the repository root:
+    python benchmarks/bench_page_cache.py --chores 200 --requests 500 --threads 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+sys.path.insert(0, BENCHMARKS)
+
+import flask_app
+from chore_store import JsonChoreStore
+from households import Household
+from loadgen import p50_p99
+from synthetic import write_json_chart
+
+
+def run(requests, threads, headers=None, before_each=None):
+    """Fires `requests` GETs to / from `threads` clients; returns latencies in ms."""
+    def one(_):
+        if before_each:
+            before_each()
+        client = flask_app.app.test_client()
+        start = time.perf_counter()
+        response = client.get('/', headers=headers or {})
+        elapsed = (time.perf_counter() - start) * 1e3
+        assert response.status_code in (200, 304)
+        return elapsed
+
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(one, range(requests)))
+
+
+def report(label, latencies):
+    p50, p99 = p50_p99(latencies)
+    print(f"  {label:<24} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--chores', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'chore_data.json')
+        write_json_chart(path, args.chores, history_per_chore=0)
+        store = JsonChoreStore(path)
+        flask_app.default_household = Household(None, store)
+
+        etag = flask_app.app.test_client().get('/').headers['ETag']
+        print(f"{args.chores} chores, {args.requests} requests over {args.threads} threads:")
+        report("no cache (render)", run(args.requests, args.threads, before_each=flask_app.default_household.page_cache.clear))
+        report("cache hit (200)", run(args.requests, args.threads))
+        report("revalidation (304)", run(args.requests, args.threads, headers={'If-None-Match': etag}))
+
+
+if __name__ == '__main__':
+    main()
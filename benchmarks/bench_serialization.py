@@ -0,0 +1,75 @@
+"""
+Times loading and saving the JSON data file in each format, with orjson and with the json module.
+
+Decode is decode_chores() on the file contents alone, load a cold
+JsonChoreStore.load() (read, decode, index and copy the chores), save a
+JsonChoreStore.save() (encode, write, fsync and rename); the legacy pretty
+format is the baseline. Run from the repository root:
+    python benchmarks/bench_serialization.py --sizes 1000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+sys.path.insert(0, BENCHMARKS)
+
+import chore_serialization
+from chore_store import JsonChoreStore
+from loadgen import measure, p50_p99
+from synthetic import write_json_chart
+
+SIZES = (1000, 100000)
+
+
+def bench(path, data_format, repeat):
+    """(decode, load and save p50 seconds, file size) for one format with the current JSON library."""
+    store = JsonChoreStore(path, data_format=data_format)
+    chores = store.load()
+    store.save(chores) # Rewrite the chart in this format before timing the load
+    def load():
+        store.invalidate()
+        store.load()
+    with open(path, 'rb') as f:
+        data = f.read()
+    decode_time, _ = p50_p99(measure(lambda: chore_serialization.decode_chores(data), runs=repeat))
+    load_time, _ = p50_p99(measure(load, runs=repeat))
+    save_time, _ = p50_p99(measure(lambda: store.save(chores), runs=repeat))
+    store.close()
+    return (decode_time, load_time, save_time), len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    orjson = chore_serialization.orjson
+    libraries = [('json', None)] + ([('orjson', orjson)] if orjson else [])
+    if orjson is None:
+        print("orjson isn't installed; timing the json module only (pip install orjson)")
+
+    for size in args.sizes:
+        print(f"{size} chores:")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'chore_data.json')
+            write_json_chart(path, size, history_per_chore=0)
+            baseline = None
+            for library, module in libraries:
+                chore_serialization.orjson = module
+                for data_format in ('pretty', 'compact', 'binary'):
+                    if data_format == 'pretty' and library != 'json':
+                        continue # Always written with the json module, for the indentation
+                    timings, size_bytes = bench(path, data_format, args.repeat)
+                    baseline = baseline or timings
+                    columns = "".join(f"   {name} {seconds * 1e3:9.1f} ms ({before / seconds:4.1f}x)"
+                                      for name, seconds, before in zip(('decode', 'load', 'save'), timings, baseline))
+                    print(f"  {data_format:<8} {library:<7}{columns}   {size_bytes / 1e6:8.2f} MB")
+        chore_serialization.orjson = orjson
+
+
+if __name__ == '__main__':
+    main()
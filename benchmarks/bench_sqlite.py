@@ -0,0 +1,63 @@
+"""
+Times point queries against the SQLite backend with years of completion history.
+
+Run from the repository root:
+    python benchmarks/bench_sqlite.py --chores 50 --years 5
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+sys.path.insert(0, BENCHMARKS)
+
+from chore_model import Chore
+from chore_sqlite import SqliteChoreStore
+from loadgen import measure, p50_p99
+
+
+def timed(label, fn, repeat):
+    """Runs fn(i) for i in 0..repeat-1 and prints the p50/p99 latency."""
+    calls = itertools.count()
+    p50, p99 = p50_p99(measure(lambda: fn(next(calls)), runs=repeat, max_runs=repeat))
+    print(f"  {label:<38} p50 {p50 * 1e6:9.1f} us   p99 {p99 * 1e6:9.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--chores', type=int, default=50)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteChoreStore(os.path.join(tmp, 'chores.db'))
+        names = [f"Chore {i}" for i in range(args.chores)]
+        store.save([Chore(name, 10, "daily") for name in names])
+
+        start_day = datetime(2020, 1, 1, 18, 0)
+        days = 365 * args.years
+        events = ((name, start_day + timedelta(days=day)) for day in range(days) for name in names)
+        start = time.perf_counter()
+        recorded = store.record_completions(events)
+        print(f"Inserted {recorded} completions in {time.perf_counter() - start:.2f}s (one transaction)")
+
+        last_day = start_day + timedelta(days=days)
+        timed("load() (cached)", lambda i: store.load(), args.repeat)
+        timed("last_completion(name)", lambda i: store.last_completion(names[i % args.chores]), args.repeat)
+        timed("last_completion(name, before=...)",
+              lambda i: store.last_completion(names[i % args.chores], before=start_day + timedelta(days=i % days)),
+              args.repeat)
+        timed("completions(name, one week)",
+              lambda i: store.completions(names[i % args.chores], since=last_day - timedelta(days=7)), args.repeat)
+        timed("record_completion()",
+              lambda i: store.record_completion(names[i % args.chores], last_day + timedelta(minutes=i)), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
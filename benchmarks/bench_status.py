@@ -0,0 +1,90 @@
+"""
+Compares the period-boundary status engine with the old per-chore status functions.
+
+Run from the repository root:
+    python benchmarks/bench_status.py --chores 10000
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+sys.path.insert(0, BENCHMARKS)
+
+from chore_model import Chore
+from chore_status import PeriodBoundaries, chore_status, evaluate
+from loadgen import measure, p50_p99
+from synthetic import chore_objects, synthetic_chores
+
+
+# The comparison runs at a fixed mid-year moment: the legacy weekly check is wrong
+# in the ISO week that spans New Year, which is what the status engine fixed
+NOW = datetime(2025, 6, 11, 18, 0)
+
+
+def legacy_get_chore_status(chore, now):
+    """get_chore_status() as it was before the status engine (with `now` passed in), for comparison."""
+    today = now.date()
+    current_week_number = today.isocalendar()[1]
+    if chore['frequency'] == "daily":
+        return "DONE" if chore['last_completed'] and chore['last_completed'].date() == today else "PENDING"
+    elif chore['frequency'] == "weekly":
+        if chore['last_completed'] and chore['last_completed'].isocalendar()[1] == current_week_number and chore['last_completed'].year == today.year:
+            return "DONE"
+        return "PENDING"
+    elif chore['frequency'] == "bi-weekly":
+        return "DONE" if chore['last_completed'] and (today - chore['last_completed'].date()).days <= 14 else "PENDING"
+    elif chore['frequency'] == "ad_hoc":
+        return "Not Recurring"
+    return "Unknown"
+
+
+def legacy_calculate_points(chores, now):
+    """calculate_points() as it was before the status engine, for comparison."""
+    today = now.date()
+    total_points_earned = 0
+    for chore in chores:
+        status = legacy_get_chore_status(chore, now)
+        if status == "DONE":
+            total_points_earned += chore['value']
+        elif chore['frequency'] == "ad_hoc" and chore['last_completed'] and chore['last_completed'].month == today.month and chore['last_completed'].year == today.year:
+            total_points_earned += chore['value']
+    return total_points_earned
+
+
+def legacy_index(chores, now):
+    """What index() used to do: one status call per chore, then calculate_points()."""
+    statuses = [legacy_get_chore_status(chore, now) for chore in chores]
+    return statuses, legacy_calculate_points(chores, now)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--chores', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    now = NOW
+    chores = chore_objects(synthetic_chores(args.chores, now))
+    # The legacy functions worked on plain dicts
+    legacy_chores = [dict(chore.to_json(), last_completed=chore.last_completed) for chore in chores]
+
+    assert legacy_index(legacy_chores, now) == evaluate(chores, now), "engine disagrees with the legacy functions"
+
+    old, old_p99 = p50_p99(measure(lambda: legacy_index(legacy_chores, now), runs=args.repeat))
+    new, new_p99 = p50_p99(measure(lambda: evaluate(chores, now), runs=args.repeat))
+    print(f"{args.chores} chores, statuses + points for one page view:")
+    print(f"  legacy get_chore_status + calculate_points: p50 {old * 1e3:8.2f} ms   p99 {old_p99 * 1e3:8.2f} ms")
+    print(f"  status engine evaluate():                   p50 {new * 1e3:8.2f} ms   p99 {new_p99 * 1e3:8.2f} ms"
+          f" ({old / new:.1f}x)")
+
+    # The year-boundary case: 2024-12-30 is in ISO week 1 of 2025
+    periods = PeriodBoundaries(datetime(2025, 1, 2, 9, 0))
+    chore = Chore("Vacuum", 40, "weekly", datetime(2024, 12, 30, 18, 0))
+    print(f"  weekly chore done Mon 2024-12-30, viewed Thu 2025-01-02: {chore_status(chore, periods)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Measures requests/sec for the index page with and without the in-memory chore store.
+
+Run from the repository root:
+    python benchmarks/bench_store.py --chores 2000 --requests 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+sys.path.insert(0, BENCHMARKS)
+
+import flask_app
+from chore_store import JsonChoreStore
+from households import Household
+from synthetic import write_json_chart
+
+
+def requests_per_second(client, requests, before_each=None):
+    """Issues `requests` GETs to / and returns the achieved rate."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        if before_each:
+            before_each()
+        response = client.get('/')
+        assert response.status_code == 200
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--chores', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'chore_data.json')
+        write_json_chart(path, args.chores, history_per_chore=0)
+        household = flask_app.default_household = Household(
+            None, JsonChoreStore(path, default_factory=flask_app.initialize_chores))
+        client = flask_app.app.test_client()
+        client.get('/') # Warm up template compilation
+
+        # "Before": re-read and parse the file on every request, like the old load_chores()
+        uncached = requests_per_second(client, args.requests, before_each=household.invalidate)
+        cached = requests_per_second(client, args.requests)
+
+    print(f"{args.chores} chores, {args.requests} requests to /")
+    print(f"  re-read every request: {uncached:10.1f} req/s")
+    print(f"  in-memory store:       {cached:10.1f} req/s ({cached / uncached:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Benchmark suite for the chore app's hot paths, from 16 to 1M chores.
+
+Times load_chores (cold and cached), save_chores, get_chore_status and
+calculate_points on synthetic charts with completion histories, then drives
+the / and /complete/... routes under gunicorn with a concurrent HTTP load
+generator. Every row reports p50/p99 latency and throughput, and the whole
+run is written to a JSON file; pass --compare to flag regressions against an
+earlier run. Run from the repository root:
+
+    python benchmarks/bench_suite.py --output bench_results.json
+    python benchmarks/bench_suite.py --max-chores 65536 --compare bench_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCHMARKS)
+
+import flask_app
+from chore_store import open_store
+from households import Household
+from loadgen import LoadGenerator, chore_mix, measure, p50_p99
+from synthetic import write_chart
+
+SIZES = (16, 256, 4096, 65536, 1048576)
+HTTP_SIZES = (16, 256, 4096)
+
+
+def function_row(chores, name, latencies):
+    p50, p99 = p50_p99(latencies)
+    return {
+        "chores": chores,
+        "name": name,
+        "runs": len(latencies),
+        "p50_ms": round(p50 * 1e3, 4),
+        "p99_ms": round(p99 * 1e3, 4),
+        "ops_per_sec": round(1 / p50, 1),
+    }
+
+
+def bench_functions(path, chores, budget):
+    """Times the flask_app helpers against the chart at `path`."""
+    household = flask_app.default_household = Household(None, open_store(path))
+    rows = []
+    rows.append(function_row(chores, "load_chores (cold)",
+                             measure(flask_app.load_chores, budget, before_each=household.store.invalidate)))
+    rows.append(function_row(chores, "load_chores (cached)", measure(flask_app.load_chores, budget)))
+
+    loaded = flask_app.load_chores()
+    rows.append(function_row(chores, "calculate_points", measure(lambda: flask_app.calculate_points(loaded), budget)))
+
+    batch = random.Random(5).choices(loaded, k=1000)
+    def status_batch():
+        for chore in batch:
+            flask_app.get_chore_status(chore)
+    rows.append(function_row(chores, "get_chore_status (per chore)",
+                             measure(status_batch, budget, per_call=len(batch))))
+
+    rows.append(function_row(chores, "save_chores", measure(lambda: flask_app.save_chores(loaded), budget)))
+    household.close()
+    return rows
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_command(server, port, workers, threads):
+    if server == 'gunicorn':
+        gunicorn = shutil.which('gunicorn')
+        if gunicorn is None:
+            raise SystemExit("gunicorn isn't installed; pip install gunicorn, or pass --server werkzeug")
+        return [gunicorn, '-w', str(workers), '-k', 'gthread', '--threads', str(threads),
+                '-b', f'127.0.0.1:{port}', 'flask_app:app']
+    # Werkzeug's threaded development server, for machines without gunicorn
+    return [sys.executable, '-c',
+            f"import flask_app; flask_app.app.run(port={port}, threaded=True)"]
+
+
+def wait_until_up(port, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server didn't start listening on port {port}")
+
+
+def bench_http(path, chores, args):
+    """Starts the app on the chart at `path` and runs the load generator against / and /complete/..."""
+    port = free_port()
+    env = dict(os.environ, CHORE_DATA_FILE=path, PYTHONPATH=ROOT)
+    process = subprocess.Popen(server_command(args.server, port, args.workers, args.threads),
+                               cwd=os.path.dirname(path), env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(port, process)
+        names = [f"Chore {i}" for i in range(chores)]
+        generator = LoadGenerator(f'http://127.0.0.1:{port}', chore_mix(names, args.complete_ratio),
+                                  concurrency=args.concurrency, duration=args.duration)
+        if args.warmup:
+            generator.run()
+        rows = generator.run()
+    finally:
+        process.terminate()
+        process.wait()
+    for row in rows:
+        row.update(chores=chores, server=args.server, concurrency=args.concurrency)
+    return rows
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Prints rows whose p50 got more than `threshold` times slower; returns how many did."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    for field in ("backend", "history_per_chore"):
+        if baseline.get("meta", {}).get(field) != results["meta"][field]:
+            print(f"warning: baseline {field} is {baseline.get('meta', {}).get(field)!r}, "
+                  f"this run's is {results['meta'][field]!r}")
+    def keyed(rows, name_field):
+        return {(row["chores"], row[name_field]): row for row in rows}
+    regressions = 0
+    for section, name_field in (("functions", "name"), ("http", "route")):
+        before = keyed(baseline.get(section, []), name_field)
+        for key, row in keyed(results.get(section, []), name_field).items():
+            old = before.get(key)
+            if not old or not old.get("p50_ms") or not row.get("p50_ms"):
+                continue
+            ratio = row["p50_ms"] / old["p50_ms"]
+            if ratio > threshold:
+                regressions += 1
+                print(f"REGRESSION {section}: {key[1]} @ {key[0]} chores: "
+                      f"p50 {old['p50_ms']} -> {row['p50_ms']} ms ({ratio:.2f}x)")
+    print(f"{regressions} regression(s) against {baseline_path} (threshold {threshold:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="chart sizes for the function timings")
+    parser.add_argument('--http-sizes', type=int, nargs='+', default=HTTP_SIZES, help="chart sizes for the HTTP load test")
+    parser.add_argument('--max-chores', type=int, help="skip sizes above this")
+    parser.add_argument('--backend', choices=('json', 'sqlite'), default='json')
+    parser.add_argument('--history', type=int, default=2, help="earlier completions per completed chore")
+    parser.add_argument('--budget', type=float, default=1.0, help="seconds to spend timing each function")
+    parser.add_argument('--no-http', action='store_true', help="only time the functions")
+    parser.add_argument('--server', choices=('gunicorn', 'werkzeug'), default='gunicorn')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8, help="gunicorn gthread threads per worker")
+    parser.add_argument('--concurrency', type=int, default=16, help="concurrent client connections")
+    parser.add_argument('--duration', type=float, default=5.0, help="seconds of load per chart size")
+    parser.add_argument('--complete-ratio', type=float, default=0.1, help="share of /complete/... requests")
+    parser.add_argument('--warmup', action='store_true', help="run the load once before measuring")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help="earlier results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.25, help="p50 slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    def capped(sizes):
+        return [size for size in sizes if args.max_chores is None or size <= args.max_chores]
+
+    extension = '.db' if args.backend == 'sqlite' else '.json'
+    results = {
+        "meta": {
+            "started": datetime.now().isoformat(timespec='seconds'),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "history_per_chore": args.history,
+        },
+        "functions": [],
+        "http": [],
+    }
+
+    for chores in capped(args.sizes):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'chore_data' + extension)
+            start = time.perf_counter()
+            write_chart(path, chores, args.history)
+            print(f"{chores} chores (generated in {time.perf_counter() - start:.1f}s):")
+            for row in bench_functions(path, chores, args.budget):
+                results["functions"].append(row)
+                print(f"  {row['name']:<30} p50 {row['p50_ms']:10.4f} ms   p99 {row['p99_ms']:10.4f} ms"
+                      f"   ({row['runs']} runs)")
+
+    if not args.no_http:
+        for chores in capped(args.http_sizes):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'chore_data' + extension)
+                write_chart(path, chores, args.history)
+                print(f"HTTP, {chores} chores, {args.server} x{args.workers}, {args.concurrency} connections:")
+                for row in bench_http(path, chores, args):
+                    results["http"].append(row)
+                    print(f"  {row['route']:<24} p50 {row['p50_ms']} ms   p99 {row['p99_ms']} ms"
+                          f"   {row['throughput_rps']} req/s   {row['errors']} errors")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
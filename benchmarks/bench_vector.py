@@ -0,0 +1,58 @@
+"""
+Compares per-household scalar evaluation with the NumPy columnar path.
+
+Run from the repository root (needs numpy):
+    python benchmarks/bench_vector.py --households 10000 --chores-per-household 50
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+sys.path.insert(0, BENCHMARKS)
+
+from chore_status import evaluate
+from chore_vector import ChoreColumns
+from loadgen import measure, p50_p99
+from synthetic import synthetic_households
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--households', type=int, default=10000)
+    parser.add_argument('--chores-per-household', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    households = synthetic_households(args.households, args.chores_per_household, now)
+    total = args.households * args.chores_per_household
+
+    scalar_statuses, scalar_points = [], {}
+    for key, chores in households.items():
+        statuses, points = evaluate(chores, now)
+        scalar_statuses.extend(statuses)
+        scalar_points[key] = points
+    columns = ChoreColumns.from_households(households)
+    assert columns.statuses(now) == scalar_statuses, "status mismatch"
+    assert columns.household_points(now) == scalar_points, "points mismatch"
+
+    def scalar_pass():
+        for chores in households.values():
+            evaluate(chores, now)
+    def vector_pass():
+        columns.status_codes(now)
+        columns.household_points(now)
+    scalar, _ = p50_p99(measure(scalar_pass, runs=args.repeat))
+    vector, _ = p50_p99(measure(vector_pass, runs=args.repeat))
+    build, _ = p50_p99(measure(lambda: ChoreColumns.from_households(households), runs=args.repeat))
+
+    print(f"{total} chores in {args.households} households (results identical), p50 of {args.repeat} runs:")
+    print(f"  scalar evaluate() per household: {scalar * 1e3:9.1f} ms")
+    print(f"  columnar statuses + points:      {vector * 1e3:9.1f} ms ({scalar / vector:.0f}x)")
+    print(f"  one-off column build:            {build * 1e3:9.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+Concurrent HTTP load generator for the chore app.
+
+Each worker thread keeps one HTTP/1.1 keep-alive connection open and issues
+requests back to back, picking a path from a weighted mix. Latencies are
+recorded per route. It works against any running server:
+
+    python benchmarks/loadgen.py http://127.0.0.1:8000 --concurrency 16 --duration 10
+
+The other benchmarks time functions with measure() and report p50_p99(),
+so every p50/p99 in the suite is the same nearest-rank percentile.
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))]
+
+
+def p50_p99(latencies):
+    """(p50, p99) of unsorted latencies, in their unit."""
+    latencies = sorted(latencies)
+    return percentile(latencies, 0.5), percentile(latencies, 0.99)
+
+
+def measure(fn, budget=0.0, runs=1, max_runs=1000, before_each=None, per_call=1):
+    """
+    Calls fn() at least `runs` times, then keeps calling it until about
+    `budget` seconds have been spent (at most `max_runs` calls), and returns
+    latencies in seconds. before_each() runs untimed before every call. With
+    per_call=N, fn() does N operations and each latency is divided by N.
+    """
+    latencies = []
+    spent = 0.0
+    while len(latencies) < runs or (spent < budget and len(latencies) < max_runs):
+        if before_each:
+            before_each()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        spent += elapsed
+        latencies.append(elapsed / per_call)
+    return latencies
+
+
+def summarize(route, latencies, errors, elapsed):
+    """p50/p99/throughput for one route; latencies in seconds."""
+    p50, p99 = p50_p99(latencies)
+    return {
+        "route": route,
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(p50 * 1e3, 3) if latencies else None,
+        "p99_ms": round(p99 * 1e3, 3) if latencies else None,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+
+
+class LoadGenerator:
+    """
+    Drives `concurrency` connections against `base_url` for `duration`
+    seconds (or until `requests` have been sent). `mix` is a list of
+    (route label, weight, path factory) where the factory returns the next path.
+    """
+
+    def __init__(self, base_url, mix, concurrency=8, duration=10.0, requests=None, timeout=30.0, seed=3):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.mix = mix
+        self.concurrency = concurrency
+        self.duration = duration
+        self.requests = requests
+        self.timeout = timeout
+        self.seed = seed
+        self._sent = 0
+        self._lock = threading.Lock()
+
+    def _next_request_allowed(self, deadline):
+        if time.perf_counter() >= deadline:
+            return False
+        if self.requests is None:
+            return True
+        with self._lock:
+            if self._sent >= self.requests:
+                return False
+            self._sent += 1
+            return True
+
+    def _worker(self, index, deadline, results):
+        rng = random.Random(self.seed + index)
+        labels = [label for label, _, _ in self.mix]
+        weights = [weight for _, weight, _ in self.mix]
+        paths = {label: factory for label, _, factory in self.mix}
+        latencies = {label: [] for label in labels}
+        errors = {label: 0 for label in labels}
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        while self._next_request_allowed(deadline):
+            label = rng.choices(labels, weights)[0]
+            path = self.prefix + paths[label](rng)
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status < 400
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            elapsed = time.perf_counter() - start
+            if ok:
+                latencies[label].append(elapsed)
+            else:
+                errors[label] += 1
+        conn.close()
+        results[index] = (latencies, errors)
+
+    def run(self):
+        """Returns a summary dict per route, plus an "all" row."""
+        results = [None] * self.concurrency
+        start = time.perf_counter()
+        deadline = start + self.duration
+        threads = [threading.Thread(target=self._worker, args=(i, deadline, results))
+                   for i in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        summaries = []
+        everything, all_errors = [], 0
+        for label, _, _ in self.mix:
+            latencies = [value for worker in results for value in worker[0][label]]
+            errors = sum(worker[1][label] for worker in results)
+            everything += latencies
+            all_errors += errors
+            summaries.append(summarize(label, latencies, errors, elapsed))
+        if len(self.mix) > 1:
+            summaries.append(summarize("all", everything, all_errors, elapsed))
+        return summaries
+
+
+def chore_mix(chore_names, complete_ratio=0.1):
+    """The default mix: mostly chart views, plus completions of random chores."""
+    quoted = [quote(name) for name in chore_names]
+    return [
+        ("GET /", 1.0 - complete_ratio, lambda rng: '/'),
+        ("GET /complete/<chore>", complete_ratio, lambda rng: '/complete/' + rng.choice(quoted)),
+    ]
+
+
+def fetch_chore_names(base_url):
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    conn.request('GET', parts.path.rstrip('/') + '/api/chores')
+    names = [chore["name"] for chore in json.loads(conn.getresponse().read())["chores"]]
+    conn.close()
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('url', help="base URL of a running chore app, e.g. http://127.0.0.1:8000")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds to run for")
+    parser.add_argument('--requests', type=int, help="stop after this many requests instead")
+    parser.add_argument('--complete-ratio', type=float, default=0.1, help="share of /complete/... requests")
+    args = parser.parse_args()
+
+    mix = chore_mix(fetch_chore_names(args.url), args.complete_ratio)
+    for row in LoadGenerator(args.url, mix, args.concurrency, args.duration, args.requests).run():
+        print(json.dumps(row))
+
+
+if __name__ == '__main__':
+    main()
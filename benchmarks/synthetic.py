@@ -0,0 +1,112 @@
+"""
+Synthetic chore charts and completion histories for the benchmarks.
+
+Charts are written straight in the on-disk formats (snapshot, journal and
+history for JSON, one bulk transaction for SQLite), so generating 1M chores
+takes seconds instead of going through a million record_completion() calls.
+"""
+import json
+import random
+from datetime import datetime, timedelta
+
+FREQUENCIES = ("daily", "weekly", "bi-weekly", "ad_hoc")
+
+
+def synthetic_chores(count, now=None, seed=7):
+    """
+    `count` chore dicts in the chore_data.json format, with a mix of
+    frequencies and completion times spread over the last 90 days.
+    """
+    now = now or datetime.now()
+    rng = random.Random(seed)
+    chores = []
+    for i in range(count):
+        completed = now - timedelta(minutes=rng.randint(0, 90 * 24 * 60)) if rng.random() < 0.7 else None
+        chores.append({
+            "id": f"chore-{i}",
+            "name": f"Chore {i}",
+            "value": 5 + i % 50,
+            "frequency": FREQUENCIES[i % 4],
+            "last_completed": completed.isoformat() if completed else None,
+            "instructions": "Synthetic benchmark chore.",
+            "assignee": f"kid-{i % 3}",
+        })
+    return chores
+
+
+def chore_objects(chores):
+    """The chore dicts as Chore objects, for benchmarks that skip the store."""
+    from chore_model import Chore
+
+    return [Chore.from_json(chore) for chore in chores]
+
+
+def synthetic_households(households, per_household, now=None, seed=7):
+    """{household key: [Chore]} with `per_household` chores each, seeded per household."""
+    return {f"household-{h}": chore_objects(synthetic_chores(per_household, now, seed + h))
+            for h in range(households)}
+
+
+def synthetic_history(chores, per_chore=2, seed=11):
+    """
+    Yields (name, completed_at) events: `per_chore` earlier completions for
+    each completed chore, ending at its last_completed, in time order per chore.
+    """
+    rng = random.Random(seed)
+    for chore in chores:
+        if not chore["last_completed"]:
+            continue
+        last = datetime.fromisoformat(chore["last_completed"])
+        for back in range(per_chore, 0, -1):
+            yield chore["name"], last - timedelta(days=back * rng.randint(1, 14))
+        yield chore["name"], last
+
+
+def write_json_chart(path, count, history_per_chore=2, journal_events=0, now=None):
+    """
+    Writes a JSON chart: the snapshot, its completion history, and optionally
+    `journal_events` not-yet-compacted completions in the journal.
+    Returns the chore dicts.
+    """
+    chores = synthetic_chores(count, now)
+    with open(path, 'w') as f:
+        json.dump(chores, f, indent=4)
+    with open(path + '.history', 'w') as f:
+        for name, completed_at in synthetic_history(chores, history_per_chore):
+            f.write(json.dumps({"name": name, "completed_at": completed_at.isoformat()}) + '\n')
+    if journal_events:
+        now = now or datetime.now()
+        with open(path + '.journal', 'w') as f:
+            for i in range(journal_events):
+                f.write(json.dumps({"name": chores[i % count]["name"], "completed_at": now.isoformat()}) + '\n')
+    return chores
+
+
+def write_sqlite_chart(path, count, history_per_chore=2, now=None):
+    """Writes a SQLite chart with the same chores and history as write_json_chart()."""
+    from chore_sqlite import SqliteChoreStore, to_db_time
+
+    chores = synthetic_chores(count, now)
+    store = SqliteChoreStore(path)
+    conn = store._connection()
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO chores (id, position, slug, name, value, frequency, instructions, last_completed, assignee)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((position + 1, position, chore["id"], chore["name"], chore["value"], chore["frequency"], chore["instructions"],
+          chore["last_completed"] and to_db_time(datetime.fromisoformat(chore["last_completed"])), chore["assignee"])
+         for position, chore in enumerate(chores)))
+    conn.executemany(
+        "INSERT INTO completions (chore_id, completed_at) VALUES (?, ?)",
+        ((int(name.rsplit(' ', 1)[1]) + 1, to_db_time(completed_at)) # Row id of "Chore <i>" is i + 1
+         for name, completed_at in synthetic_history(chores, history_per_chore)))
+    conn.execute("COMMIT")
+    store.close()
+    return chores
+
+
+def write_chart(path, count, history_per_chore=2, now=None):
+    """Writes a chart in the format the file extension asks for."""
+    if path.endswith(('.db', '.sqlite', '.sqlite3')):
+        return write_sqlite_chart(path, count, history_per_chore, now)
+    return write_json_chart(path, count, history_per_chore, now=now)
@@ -1,37 +1,57 @@
+"""
+The chore chart on the command line.
+
+Run without arguments for the interactive menu, or with a subcommand for
+scripts and bulk jobs:
+
+    python chore_chart.py status [--format csv|ndjson] [--assignee NAME]
+    python chore_chart.py complete make-bed vacuum-living-room [--at 2025-01-06T18:00] [--by NAME]
+    python chore_chart.py export completions -o history.csv
+    python chore_chart.py import completions history.ndjson
+    python chore_chart.py report [--period week] [--count 8]
+
+Subcommands use the same store (CHORE_DATA_FILE / CHORE_HOUSEHOLD) and status
+engine as flask_app.py. Imports and exports are streamed record by record, and
+an import of completions is recorded as one transaction: if any record is
+bad, nothing is written.
+"""
+import argparse
+import csv
 import json
-from datetime import datetime, timedelta
-
-DATA_FILE = 'chore_data.json' # File to save chore data
-DAILY_CHORES_TO_RESET = [] # Chores that reset daily
-BI_WEEKLY_CHORES_TO_RESET = [] # Chores that reset bi-weekly
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+from chore_model import Chore, Frequency
+from chore_scheduler import RolloverScheduler
+from chore_serialization import from_timestamp
+from chore_status import DONE, PeriodBoundaries, evaluate
+from chore_store import open_store
+from households import HouseholdRegistry
+from points_ledger import PERIODS, PointsLedger, bucket_label
+
+# File to save chore data; point it at a .db file to use the SQLite backend instead
+DATA_FILE = os.environ.get('CHORE_DATA_FILE', 'chore_data.json')
+# Set CHORE_HOUSEHOLD to work on one household's chart (see households.py) instead of DATA_FILE
+HOUSEHOLD = os.environ.get('CHORE_HOUSEHOLD')
+HOUSEHOLDS_DIR = os.environ.get('CHORE_HOUSEHOLDS_DIR', 'households')
+HOUSEHOLD_EXTENSION = os.environ.get('CHORE_HOUSEHOLD_EXTENSION', '.json')
+
+if HOUSEHOLD:
+    DATA_FILE = HouseholdRegistry(HOUSEHOLDS_DIR, extension=HOUSEHOLD_EXTENSION).path(HOUSEHOLD)
+    os.makedirs(HOUSEHOLDS_DIR, exist_ok=True)
+
+store = open_store(DATA_FILE) # Shares the data file with flask_app.py
+schedule = RolloverScheduler(store) # Statuses roll over by themselves at day/week/month boundaries
 
 def load_chores():
-    """Loads chore data from a JSON file."""
-    try:
-        with open(DATA_FILE, 'r') as f:
-            chores_data = json.load(f)
-            # Convert string dates back to datetime objects
-            for chore in chores_data:
-                if 'last_completed' in chore and chore['last_completed']:
-                    chore['last_completed'] = datetime.fromisoformat(chore['last_completed'])
-            return chores_data
-    except FileNotFoundError:
-        return [] # Return empty list if file doesn't exist
-    except json.JSONDecodeError:
-        print("Error reading chore data. Starting with an empty list.")
-        return []
+    """Loads chore data from the JSON file (empty list if it doesn't exist)."""
+    return store.load()
 
 def save_chores(chores):
-    """Saves chore data to a JSON file."""
-    # Convert datetime objects to string for JSON serialization
-    serializable_chores = []
-    for chore in chores:
-        temp_chore = chore.copy()
-        if 'last_completed' in temp_chore and temp_chore['last_completed']:
-            temp_chore['last_completed'] = temp_chore['last_completed'].isoformat()
-        serializable_chores.append(temp_chore)
-    with open(DATA_FILE, 'w') as f:
-        json.dump(serializable_chores, f, indent=4)
+    """Saves chore data to the JSON file."""
+    store.save(chores)
 
 def initialize_chores():
     """
@@ -39,95 +59,65 @@ def initialize_chores():
     You can customize this list!
     """
     return [
-        {"name": "Make Bed", "value": 10, "frequency": "daily", "last_completed": None},
-        {"name": "Tidy Room (Clothes/Desk)", "value": 15, "frequency": "daily", "last_completed": None},
-        {"name": "Load/Unload Dishwasher", "value": 20, "frequency": "daily", "last_completed": None},
-        {"name": "Take Out Kitchen Trash", "value": 5, "frequency": "daily", "last_completed": None},
-
-        {"name": "Clean His Bathroom (Toilet, Sink, Mirror)", "value": 50, "frequency": "weekly", "last_completed": None},
-        {"name": "Vacuum Living Room", "value": 40, "frequency": "weekly", "last_completed": None},
-        {"name": "Wipe Down Kitchen Counters/Stovetop", "value": 25, "frequency": "weekly", "last_completed": None},
-        {"name": "Sort & Fold Own Laundry", "value": 30, "frequency": "weekly", "last_completed": None},
-
-        {"name": "Sweep/Blow Front/Back Patios", "value": 35, "frequency": "bi-weekly", "last_completed": None},
-        {"name": "Weed Small Front Garden Bed", "value": 60, "frequency": "bi-weekly", "last_completed": None},
-        {"name": "Deep Clean Shower", "value": 75, "frequency": "bi-weekly", "last_completed": None},
-        {"name": "Empty All House Trash Bins", "value": 30, "frequency": "bi-weekly", "last_completed": None},
-
-        {"name": "Mow Front Lawn", "value": 100, "frequency": "monthly_or_ad_hoc", "last_completed": None},
-        {"name": "Wash Car (Exterior)", "value": 80, "frequency": "monthly_or_ad_hoc", "last_completed": None},
-        {"name": "Clean Out Refrigerator (Shelves)", "value": 90, "frequency": "monthly_or_ad_hoc", "last_completed": None},
-        {"name": "Clean Garage (Sweep/Organize Area)", "value": 120, "frequency": "monthly_or_ad_hoc", "last_completed": None},
+        Chore("Make Bed", 10, Frequency.DAILY),
+        Chore("Tidy Room (Clothes/Desk)", 15, Frequency.DAILY),
+        Chore("Load/Unload Dishwasher", 20, Frequency.DAILY),
+        Chore("Take Out Kitchen Trash", 5, Frequency.DAILY),
+
+        Chore("Clean His Bathroom (Toilet, Sink, Mirror)", 50, Frequency.WEEKLY),
+        Chore("Vacuum Living Room", 40, Frequency.WEEKLY),
+        Chore("Wipe Down Kitchen Counters/Stovetop", 25, Frequency.WEEKLY),
+        Chore("Sort & Fold Own Laundry", 30, Frequency.WEEKLY),
+
+        Chore("Sweep/Blow Front/Back Patios", 35, Frequency.BI_WEEKLY),
+        Chore("Weed Small Front Garden Bed", 60, Frequency.BI_WEEKLY),
+        Chore("Deep Clean Shower", 75, Frequency.BI_WEEKLY),
+        Chore("Empty All House Trash Bins", 30, Frequency.BI_WEEKLY),
+
+        Chore("Mow Front Lawn", 100, Frequency.AD_HOC),
+        Chore("Wash Car (Exterior)", 80, Frequency.AD_HOC),
+        Chore("Clean Out Refrigerator (Shelves)", 90, Frequency.AD_HOC),
+        Chore("Clean Garage (Sweep/Organize Area)", 120, Frequency.AD_HOC),
     ]
 
 def display_chores(chores):
     """Displays the current list of chores."""
     print("\n--- Chore Chart ---")
-    total_points_available = 0
-    total_earned_points = 0
 
     if not chores:
         print("No chores currently defined. Add some!")
         return
 
-    # Check for overdue/resettable chores for daily/bi-weekly resets
-    today = datetime.now().date()
-    current_week_number = today.isocalendar()[1] # Week number of the year
+    # Statuses and points for every chore, all against the same "now"
+    statuses, total_earned_points = evaluate(chores)
+
+    def last_done(chore):
+        return chore.last_completed.strftime('%Y-%m-%d') if chore.last_completed else "Never"
+
+    def name(chore):
+        return f"{chore.name} [{chore.assignee}]" if chore.assignee else chore.name
 
     print("\n--- Daily Chores ---")
     for i, chore in enumerate(chores):
-        if chore['frequency'] == "daily":
-            is_completed_today = False
-            if chore['last_completed'] and chore['last_completed'].date() == today:
-                is_completed_today = True
-                total_earned_points += chore['value']
-            
-            status = "DONE" if is_completed_today else "PENDING"
-            print(f"{i+1}. {chore['name']} ({chore['value']} pts) - Status: {status}")
-            total_points_available += chore['value']
+        if chore.frequency is Frequency.DAILY:
+            print(f"{i+1}. {name(chore)} ({chore.value} pts) - Status: {statuses[i]}")
 
     print("\n--- Weekly Chores ---")
     for i, chore in enumerate(chores):
-        if chore['frequency'] == "weekly":
-            # Chores completed this week count
-            is_completed_this_week = False
-            if chore['last_completed'] and chore['last_completed'].isocalendar()[1] == current_week_number and chore['last_completed'].year == today.year:
-                is_completed_this_week = True
-                total_earned_points += chore['value']
-
-            status = "DONE" if is_completed_this_week else "PENDING"
-            last_done_str = chore['last_completed'].strftime('%Y-%m-%d') if chore['last_completed'] else "Never"
-            print(f"{i+1}. {chore['name']} ({chore['value']} pts) - Last Done: {last_done_str} - Status: {status}")
-            total_points_available += chore['value']
+        if chore.frequency is Frequency.WEEKLY:
+            print(f"{i+1}. {name(chore)} ({chore.value} pts) - Last Done: {last_done(chore)} - Status: {statuses[i]}")
 
     print("\n--- Bi-Weekly Chores ---")
     for i, chore in enumerate(chores):
-        if chore['frequency'] == "bi-weekly":
-            # Simple check: if current week is odd/even, and it was done in that specific odd/even week
-            # Or you can define specific reset dates for bi-weekly chores in the main script logic.
-            # For simplicity, we'll just check if it was done recently enough based on current date.
-            
-            # Simple bi-weekly logic: If last_completed is within the last 14 days, consider it done.
-            is_completed_recently = False
-            if chore['last_completed'] and (today - chore['last_completed'].date()).days <= 14:
-                is_completed_recently = True
-                total_earned_points += chore['value']
-
-            status = "DONE" if is_completed_recently else "PENDING"
-            last_done_str = chore['last_completed'].strftime('%Y-%m-%d') if chore['last_completed'] else "Never"
-            print(f"{i+1}. {chore['name']} ({chore['value']} pts) - Last Done: {last_done_str} - Status: {status}")
-            total_points_available += chore['value']
-    
+        if chore.frequency is Frequency.BI_WEEKLY:
+            # Done if completed within the last 14 days
+            print(f"{i+1}. {name(chore)} ({chore.value} pts) - Last Done: {last_done(chore)} - Status: {statuses[i]}")
+
     print("\n--- Monthly/Ad-Hoc Chores ---")
     for i, chore in enumerate(chores):
-        if chore['frequency'] == "monthly_or_ad_hoc":
-            last_done_str = chore['last_completed'].strftime('%Y-%m-%d') if chore['last_completed'] else "Never"
-            print(f"{i+1}. {chore['name']} ({chore['value']} pts) - Last Done: {last_done_str}")
-            # Ad-hoc chores are not 'pending' unless specifically assigned, so they don't contribute to 'available' points directly for general calculation,
-            # but we can count them when completed.
-            if chore['last_completed'] and chore['last_completed'].month == today.month and chore['last_completed'].year == today.year:
-                 total_earned_points += chore['value']
-
+        if chore.frequency is Frequency.AD_HOC:
+            # Ad-hoc chores are never 'pending'; they count towards points when done this month
+            print(f"{i+1}. {name(chore)} ({chore.value} pts) - Last Done: {last_done(chore)}")
 
     print("\n-------------------")
     print(f"Total Points Earned This Period: {total_earned_points}") # You'll define what "this period" means (e.g., current week, current month)
@@ -145,30 +135,28 @@ def mark_chore_complete(chores):
             if 1 <= choice <= len(chores):
                 selected_chore_index = choice - 1
                 chore = chores[selected_chore_index]
-                
-                # Check if chore can be marked complete based on frequency (e.g., daily chores already done today)
-                today = datetime.now().date()
-                if chore['frequency'] == "daily" and chore['last_completed'] and chore['last_completed'].date() == today:
-                    print(f"'{chore['name']}' has already been completed today. Choose another chore.")
-                    continue
-                
-                # Bi-weekly check - optional, can be customized
-                if chore['frequency'] == "bi-weekly":
-                    if chore['last_completed'] and (today - chore['last_completed'].date()).days <= 14:
-                         print(f"'{chore['name']}' was completed within the last two weeks. Choose another chore.")
-                         continue
-
-
-                chore['last_completed'] = datetime.now()
-                print(f"'{chore['name']}' marked as complete! You earned {chore['value']} points.")
-                save_chores(chores)
-                break
+
+                # Chores already done for their period (e.g. daily chores done today, maybe on the
+                # web app meanwhile) are skipped; the store checks under its write lock
+                periods = PeriodBoundaries()
+                skipped = []
+                if store.record_completions([(chore.name, periods.now)], skip_if_done=periods, skipped=skipped):
+                    print(f"'{chore.name}' marked as complete! You earned {chore.value} points.")
+                    break
+                if not skipped:
+                    print(f"'{chore.name}' no longer exists. Choose another chore.")
+                elif chore.frequency is Frequency.DAILY:
+                    print(f"'{chore.name}' has already been completed today. Choose another chore.")
+                elif chore.frequency is Frequency.BI_WEEKLY:
+                    print(f"'{chore.name}' was completed within the last two weeks. Choose another chore.")
+                else:
+                    print(f"'{chore.name}' has already been completed this week. Choose another chore.")
             else:
                 print("Invalid chore number. Please try again.")
         except ValueError:
             print("Invalid input. Please enter a number.")
 
-def add_new_chore(chores):
+def add_new_chore():
     """Allows adding a new chore."""
     name = input("Enter the new chore's name: ").strip()
     if not name:
@@ -184,79 +172,42 @@ def add_new_chore(chores):
         print("Invalid point value. Please enter a number.")
         return
 
-    frequency_options = ["daily", "weekly", "bi-weekly", "monthly_or_ad_hoc"]
-    frequency = ""
-    while frequency not in frequency_options:
-        frequency = input(f"Enter frequency ({', '.join(frequency_options)}): ").strip().lower()
-        if frequency not in frequency_options:
+    frequency_options = [frequency.value for frequency in Frequency]
+    frequency = None
+    while frequency is None:
+        try:
+            frequency = Frequency.parse(input(f"Enter frequency ({', '.join(frequency_options)}): ").strip().lower())
+        except ValueError:
             print("Invalid frequency. Please choose from the options.")
 
-    chores.append({"name": name, "value": value, "frequency": frequency, "last_completed": None})
-    save_chores(chores)
-    print(f"'{name}' added successfully!")
-
-def reset_chores_for_new_period(chores):
-    """
-    Resets "daily" chores at the start of a new day,
-    "weekly" chores at the start of a new week (Monday),
-    and "bi-weekly" chores every other week.
-    This function should ideally be run once per day/week by you.
-    """
-    today = datetime.now().date()
-    current_week_number = today.isocalendar()[1] # Week number of the year
-
-    print("\nChecking for chores to reset...")
-    chores_reset_count = 0
-    for chore in chores:
-        # Daily reset: if last completed was not today, it's pending again
-        if chore['frequency'] == "daily":
-            if chore['last_completed'] and chore['last_completed'].date() < today:
-                # No actual reset needed, it's just 'pending' again in the display logic.
-                # We can add it to a list if we want to confirm a visual reset.
-                pass 
-            elif not chore['last_completed']: # If never completed, it's always pending
-                pass
-
-        # Weekly reset: if last completed was in a previous week, it's pending again
-        if chore['frequency'] == "weekly":
-            if chore['last_completed'] and (chore['last_completed'].isocalendar()[1] != current_week_number or chore['last_completed'].year < today.year):
-                # Resetting 'last_completed' to None means it's available again for points this week.
-                # We could set it to the start of the current week for more nuanced tracking if needed.
-                # For simplicity, we just leave it if it was done this week, otherwise it's effectively "reset"
-                pass 
-            elif not chore['last_completed']:
-                pass
-                
-        # Bi-weekly reset: more complex. Let's make it simple.
-        # If the last_completed date is older than 14 days, it's "reset".
-        # Or, we can have a global flag/specific date for when bi-weekly chores should be available.
-        # For this simplified version, the display function determines if it's "pending" based on last_completed.
-        # The true "reset" is often just marking it complete, and the system waits till next period.
-        
-        # This function primarily serves to inform you if a new period has started.
-        # The main display and mark complete logic handles if points are earned.
-        pass # No explicit resetting of 'last_completed' in this function to avoid losing history.
-    
-    print("Reset check complete. Display will reflect current status.")
-    # For a true "reset" that clears 'last_completed' for *all* daily/weekly/bi-weekly chores
-    # at a specific time (e.g., midnight Sunday for weekly, midnight daily for daily),
-    # you'd need a more advanced scheduler (outside this simple script's scope).
-    # For now, the 'display_chores' logic and 'mark_chore_complete' prevents double-counting.
-    save_chores(chores) # Save any implicit changes, though none explicitly made here.
-
-
-def main():
-    """Main function to run the chore chart program."""
-    chores = load_chores()
-
-    # If no chores are loaded (first run or file error), initialize them
-    if not chores:
-        chores = initialize_chores()
-        save_chores(chores) # Save initial chores
-
-    # A simple way to handle daily/weekly resets: you manually trigger it.
-    # In a real application, this would run automatically at specific times.
-    reset_chores_for_new_period(chores) 
+    assignee = input("Assign it to (leave empty for anyone): ").strip() or None
+
+    # Appended to the list as stored right now, under the store's lock, so chores added or
+    # completed elsewhere while we were asking aren't overwritten
+    def add(chores):
+        if any(chore.name == name for chore in chores):
+            return False
+        chores.append(Chore(name, value, frequency, assignee=assignee))
+        return True
+    if store.update_chores(add):
+        print(f"'{name}' added successfully!")
+    else:
+        print(f"There is already a chore called '{name}'.")
+
+def interactive():
+    """The menu-driven chore chart."""
+    # If no chores are stored yet (first run or file error), initialize them
+    def seed(chores):
+        if not chores: # Unless another process got there first
+            chores.extend(initialize_chores())
+    if not load_chores():
+        store.update_chores(seed)
+
+    # No reset pass (or rewrite of the data file) is needed at startup: statuses are
+    # derived from last_completed, and the scheduler rolls them over at each boundary.
+    snapshot = schedule.snapshot()
+    print(f"\nStatuses are current as of {snapshot.periods.now:%Y-%m-%d %H:%M}; "
+          f"next reset at {snapshot.next_rollover:%Y-%m-%d %H:%M}.")
 
     while True:
         print("\n--- Main Menu ---")
@@ -267,17 +218,288 @@ def main():
         
         choice = input("Enter your choice: ")
 
+        # Re-read on every pass (cheap unless the data file changed), so completions and
+        # chores added by the web app or another CLI show up
         if choice == '1':
-            display_chores(chores)
+            display_chores(load_chores())
         elif choice == '2':
-            mark_chore_complete(chores)
+            mark_chore_complete(load_chores())
         elif choice == '3':
-            add_new_chore(chores)
+            add_new_chore()
         elif choice == '4':
             print("Exiting Chore Chart. Goodbye!")
             break
         else:
             print("Invalid choice. Please try again.")
 
+# --- Batch mode ---
+
+FORMATS = ('csv', 'ndjson')
+CHORE_FIELDS = ('id', 'name', 'value', 'frequency', 'last_completed', 'instructions', 'assignee')
+STATUS_FIELDS = ('id', 'name', 'value', 'frequency', 'status', 'last_completed', 'assignee')
+COMPLETION_FIELDS = ('name', 'completed_at', 'by')
+
+def guess_format(path, requested):
+    """--format if given, else csv for *.csv files and NDJSON for everything else."""
+    if requested:
+        return requested
+    return 'csv' if path and path.lower().endswith('.csv') else 'ndjson'
+
+def open_output(path):
+    return sys.stdout if path in (None, '-') else open(path, 'w', newline='', encoding='utf-8')
+
+def open_input(path):
+    return sys.stdin if path in (None, '-') else open(path, 'r', newline='', encoding='utf-8')
+
+def read_records(f, data_format):
+    """Yields one dict per CSV row or NDJSON line, without reading the whole file."""
+    if data_format == 'csv':
+        for row in csv.DictReader(f):
+            yield {key: value if value != '' else None for key, value in row.items()}
+    else:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def write_records(records, fields, f, data_format):
+    """Writes dicts as CSV rows or NDJSON lines as they come; returns how many."""
+    count = 0
+    if data_format == 'csv':
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    else:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+            count += 1
+    f.flush()
+    return count
+
+def completion_from_record(record):
+    """
+    (name, completed_at, by) from {"name", "completed_at": ISO} or a
+    journal-style {"name", "at": microseconds}; "by" is optional in both.
+    """
+    if record.get('at') is not None:
+        return record['name'], from_timestamp(int(record['at'])), record.get('by')
+    return record['name'], datetime.fromisoformat(record['completed_at']), record.get('by')
+
+def parse_completions(records):
+    for number, record in enumerate(records, 1):
+        try:
+            yield completion_from_record(record)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"record {number}: {e!r}") from None
+
+def status_records(snapshot, assignee=None):
+    for chore, status in zip(snapshot.chores, snapshot.statuses):
+        if assignee is None or chore.assignee == assignee:
+            yield dict(chore.to_json(), status=status)
+
+def cmd_status(args):
+    """Prints every chore's status, computed once against the same "now"."""
+    snapshot = schedule.snapshot()
+    records = status_records(snapshot, args.assignee)
+    if args.format:
+        write_records(records, STATUS_FIELDS, sys.stdout, args.format)
+        return 0
+    for record in records:
+        owner = f" [{record['assignee']}]" if record['assignee'] else ""
+        print(f"{record['id']:<40} {record['status']:<14} {record['value']:>4} pts  {record['name']}{owner}")
+    print(f"Total points earned this period: {snapshot.points}")
+    return 0
+
+def cmd_complete(args):
+    """
+    Completes chores by id in one transaction, like POST /api/completions:
+    if any id is unknown nothing is written, and chores already done for
+    their period are skipped.
+    """
+    chores = {chore_id: store.find(chore_id) for chore_id in args.ids}
+    unknown = [chore_id for chore_id, chore in chores.items() if chore is None]
+    if unknown:
+        print(f"Unknown chore ids: {', '.join(unknown)}. Nothing was completed.", file=sys.stderr)
+        return 1
+    periods = PeriodBoundaries(args.at) if args.at else PeriodBoundaries()
+    skipped = [] # Checked under the store's write lock, so a concurrent completion isn't repeated
+    store.record_completions([(chore.name, periods.now, args.by) for chore in chores.values()],
+                             skip_if_done=periods, skipped=skipped)
+    completed = [chore for chore in chores.values() if chore.name not in skipped]
+    already_done = [chore for chore in chores.values() if chore.name in skipped]
+    if completed:
+        print(f"Completed: {', '.join(chore.id for chore in completed)} "
+              f"({sum(chore.value for chore in completed)} pts)")
+    if already_done:
+        print(f"Already done for this period: {', '.join(chore.id for chore in already_done)}")
+    return 0
+
+def cmd_export(args):
+    data_format = guess_format(args.output, args.format)
+    if args.kind == 'chores':
+        records = (chore.to_json() for chore in store.load())
+        fields = CHORE_FIELDS
+    else:
+        records = ({"name": name, "completed_at": completed_at.isoformat(), "by": by}
+                   for name, completed_at, by in store.iter_completions(with_by=True))
+        fields = COMPLETION_FIELDS
+    f = open_output(args.output)
+    try:
+        count = write_records(records, fields, f, data_format)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    print(f"Exported {count} {args.kind}.", file=sys.stderr)
+    return 0
+
+def chore_from_record(record):
+    """A Chore from an exported chore record; ValueError if it can't be one."""
+    if not record.get('name'):
+        raise ValueError("every chore needs a name")
+    return Chore.from_json(record)
+
+def import_chores(records):
+    """
+    Adds new chores and replaces existing ones with the same id, or else the
+    same name; returns how many. A chore matched by name keeps its own id.
+    """
+    # Parsed up front, so a bad record fails before the store is locked
+    imported = [chore_from_record(record) for record in records]
+
+    def merge(chores):
+        by_id = {chore.id: position for position, chore in enumerate(chores)}
+        by_name = {chore.name: position for position, chore in enumerate(chores)}
+        for chore in imported:
+            position = by_id.get(chore.id) if chore.id else None
+            named = by_name.get(chore.name)
+            if position is None:
+                position = named
+                if position is not None:
+                    chore.id = chores[position].id
+            elif named is not None and named != position:
+                raise ValueError(f"can't rename chore {chore.id!r} to {chore.name!r}, another chore has that name")
+            if position is None:
+                position = len(chores)
+                chores.append(chore)
+            else:
+                del by_name[chores[position].name]
+                chores[position] = chore
+            by_name[chore.name] = position
+            if chore.id:
+                by_id[chore.id] = position
+    # Merged into the list as stored, under the store's write lock
+    store.update_chores(merge)
+    return len(imported)
+
+def cmd_import(args):
+    data_format = guess_format(args.input, args.format)
+    f = open_input(args.input)
+    seen = 0
+    def counted(events):
+        nonlocal seen
+        for event in events:
+            seen += 1
+            yield event
+    try:
+        records = read_records(f, data_format)
+        if args.kind == 'chores':
+            print(f"Imported {import_chores(records)} chores.")
+            return 0
+        # One transaction for the whole file, written as it is read
+        recorded = store.record_completions(counted(parse_completions(records)))
+    except (KeyError, TypeError, ValueError, OSError, sqlite3.Error) as e:
+        # Bad records and backend errors both leave the store as it was
+        print(f"Import failed, nothing was imported: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    skipped = f" ({seen - recorded} didn't match a chore)" if seen != recorded else ""
+    print(f"Imported {recorded} of {seen} completions{skipped}.")
+    return 0
+
+def cmd_report(args):
+    """Points for today, this week and this month, a trend, and how many chores are done."""
+    snapshot = schedule.snapshot()
+    ledger = PointsLedger(store)
+    ledger.roll_over(snapshot.periods)
+    statuses = [status for chore, status in zip(snapshot.chores, snapshot.statuses)
+                if args.assignee is None or chore.assignee == args.assignee]
+    report = {
+        "today": ledger.points('day'),
+        "this_week": ledger.points('week'),
+        "this_month": ledger.points('month'),
+        "chores": len(statuses),
+        "done": statuses.count(DONE),
+        "trend": [{"period": bucket_label(args.period, bucket), "points": points}
+                  for bucket, points in ledger.trend(args.period, args.count)],
+    }
+    if args.format == 'json':
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"Points today: {report['today']}   this week: {report['this_week']}   "
+          f"this month: {report['this_month']}")
+    print(f"Chores done: {report['done']} of {report['chores']}")
+    print(f"Points per {args.period}:")
+    peak = max([row["points"] for row in report["trend"]] + [1])
+    for row in report["trend"]:
+        print(f"  {row['period']:<10} {row['points']:>6}  {'#' * round(40 * row['points'] / peak)}".rstrip())
+    return 0
+
+def trend_count(value):
+    """--count for `report`: between 1 and 366, like /api/points."""
+    count = int(value)
+    if not 1 <= count <= 366:
+        raise argparse.ArgumentTypeError("must be between 1 and 366")
+    return count
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Chore chart. Run without a command for the interactive menu.")
+    commands = parser.add_subparsers(dest='command')
+
+    status = commands.add_parser('status', help="print every chore's status")
+    status.add_argument('--format', choices=FORMATS, help="machine-readable output instead of a table")
+    status.add_argument('--assignee', help="only chores assigned to this person")
+    status.set_defaults(run=cmd_status)
+
+    complete = commands.add_parser('complete', help="mark chores complete by id")
+    complete.add_argument('ids', nargs='+', metavar='ID')
+    complete.add_argument('--at', type=datetime.fromisoformat, help="completion time (ISO 8601), default now")
+    complete.add_argument('--by', help="who did the chores, kept in the completion history")
+    complete.set_defaults(run=cmd_complete)
+
+    for name, run, help in (('export', cmd_export, "write chores or completion history"),
+                            ('import', cmd_import, "read chores or completion history")):
+        command = commands.add_parser(name, help=help)
+        command.add_argument('kind', choices=('chores', 'completions'))
+        if name == 'export':
+            command.add_argument('-o', '--output', help="file to write (default stdout)")
+        else:
+            command.add_argument('input', nargs='?', help="file to read (default stdin)")
+        command.add_argument('--format', choices=FORMATS, help="default: csv for *.csv, else ndjson")
+        command.set_defaults(run=run)
+
+    report = commands.add_parser('report', help="points per period and chores done")
+    report.add_argument('--period', choices=PERIODS, default='week')
+    report.add_argument('--count', type=trend_count, default=8, help="periods in the trend (1-366)")
+    report.add_argument('--assignee', help="only count this person's chores as done")
+    report.add_argument('--format', choices=('text', 'json'), default='text')
+    report.set_defaults(run=cmd_report)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        interactive()
+        return 0
+    try:
+        return args.run(args)
+    except BrokenPipeError: # e.g. `status | head`; stop quietly like other command-line tools
+        sys.stdout = open(os.devnull, 'w')
+        return 1
+    finally:
+        store.close()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Server-sent events for live chart updates.
+
+Each worker process keeps one shared status snapshot and streams only what
+changed (statuses by chore id and the points total) to its connected
+browsers. Completions made in the same process wake the streams at once via
+notify(), and so do period rollovers (see chore_scheduler.py); completions
+made by other gunicorn workers or the CLI are picked up by polling the store,
+which for the JSON backend costs two stat() calls and for SQLite one PRAGMA,
+so no external broker is needed.
+
+Every open stream holds a connection, and under Flask a worker thread, so
+live updates are opt-in (CHORE_LIVE_UPDATES): gunicorn.conf.py runs threaded
+workers and turns them on, and Flask streams end after a while so abandoned
+tabs give their thread back (the browser reconnects after `retry:`).
+asgi_app.py turns them on too; there a stream is an idle coroutine
+(astream()) rather than a thread.
+"""
+import asyncio
+import json
+import threading
+import time
+
+
+def format_event(event, payload):
+    """One SSE message."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+class ChoreEvents:
+    """Fans out status/points deltas to SSE clients of a single worker."""
+
+    def __init__(self, schedule, poll_interval=1.0, heartbeat=15.0):
+        self.schedule = schedule # chore_scheduler.RolloverScheduler holding the precomputed statuses
+        self.poll_interval = poll_interval # How often to look for changes from other processes
+        self.heartbeat = heartbeat # Seconds of silence before a keep-alive comment
+        self._condition = threading.Condition()
+        self._snapshot = None # (key, {chore id: status}, points)
+        self._snapshot_lock = threading.Lock()
+        self._async_waiters = set() # (event loop, asyncio.Event) for each async stream
+
+    def notify(self):
+        """Wakes every stream in this process; call after completing chores."""
+        with self._condition:
+            self._condition.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, wake in waiters:
+            loop.call_soon_threadsafe(wake.set)
+
+    def snapshot(self):
+        """
+        Returns (key, statuses by id, points) from the scheduler's snapshot,
+        which only changes on a completion or a rollover, shared by all streams
+        in the worker.
+        """
+        current = self.schedule.snapshot()
+        with self._snapshot_lock:
+            if self._snapshot is None or self._snapshot[0] != current.key:
+                statuses = {chore.id: status for chore, status in zip(current.chores, current.statuses)}
+                self._snapshot = (current.key, statuses, current.points)
+            return self._snapshot
+
+    @staticmethod
+    def first_events(snapshot):
+        """The messages every new stream starts with."""
+        _, statuses, points = snapshot
+        yield "retry: 3000\n\n" # Reconnect after 3s if the connection drops
+        yield format_event('snapshot', {"points_earned": points, "chores": statuses})
+
+    @staticmethod
+    def diff(old, new):
+        """The SSE message that takes a client from one snapshot to the next, or None."""
+        if new[0] == old[0]:
+            return None
+        if new[1].keys() != old[1].keys():
+            # Chores were added or removed: the page layout itself changed
+            return format_event('reload', {})
+        changed = {chore_id: status for chore_id, status in new[1].items() if old[1][chore_id] != status}
+        if changed or new[2] != old[2]:
+            return format_event('update', {"points_earned": new[2], "chores": changed})
+        return None
+
+    def stream(self, max_duration=None):
+        """
+        Generator of SSE messages for one client; runs until the client
+        disconnects, or for at most `max_duration` seconds.
+        """
+        current = self.snapshot()
+        yield from self.first_events(current)
+        last_sent = started = time.monotonic()
+        while max_duration is None or time.monotonic() - started < max_duration:
+            with self._condition:
+                self._condition.wait(self.poll_interval)
+            latest = self.snapshot()
+            message = self.diff(current, latest)
+            current = latest
+            if message is None and time.monotonic() - last_sent >= self.heartbeat:
+                message = ": keep-alive\n\n"
+            if message is not None:
+                yield message
+                last_sent = time.monotonic()
+
+    async def astream(self):
+        """
+        Async version of stream() for the ASGI app: waiting costs no thread, and
+        snapshots (which touch the disk) are taken off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        waiter = (loop, wake)
+        with self._condition:
+            self._async_waiters.add(waiter)
+        try:
+            current = await asyncio.to_thread(self.snapshot)
+            for message in self.first_events(current):
+                yield message
+            last_sent = time.monotonic()
+            while True:
+                try:
+                    await asyncio.wait_for(wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                wake.clear()
+                latest = await asyncio.to_thread(self.snapshot)
+                message = self.diff(current, latest)
+                current = latest
+                if message is None and time.monotonic() - last_sent >= self.heartbeat:
+                    message = ": keep-alive\n\n"
+                if message is not None:
+                    yield message
+                    last_sent = time.monotonic()
+        finally:
+            with self._condition:
+                self._async_waiters.discard(waiter)
@@ -0,0 +1,109 @@
+"""
+The Chore model shared by flask_app.py, chore_chart.py and the storage backends.
+"""
+import re
+from datetime import datetime
+from enum import Enum
+
+
+class Frequency(str, Enum):
+    """How often a chore comes around. Members are singletons, so compare with `is`."""
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    BI_WEEKLY = "bi-weekly"
+    AD_HOC = "ad_hoc"
+
+    @classmethod
+    def parse(cls, value):
+        """Accepts a Frequency, its string value or one of the legacy spellings."""
+        try:
+            return FREQUENCY_LOOKUP[value]
+        except KeyError:
+            raise ValueError(f"Unknown chore frequency: {value!r}") from None
+
+
+# Older chore_chart.py data files wrote ad-hoc chores as "monthly_or_ad_hoc"
+FREQUENCY_ALIASES = {"monthly_or_ad_hoc": Frequency.AD_HOC, "biweekly": Frequency.BI_WEEKLY}
+# Every accepted spelling mapped to its (interned) member; members hash like their values
+FREQUENCY_LOOKUP = {**{frequency.value: frequency for frequency in Frequency}, **FREQUENCY_ALIASES}
+
+
+class Chore:
+    """A single chore. Uses __slots__ so large charts don't pay for a dict per chore."""
+    __slots__ = ('id', 'name', 'value', 'frequency', 'last_completed', 'instructions', 'assignee')
+
+    def __init__(self, name, value, frequency, last_completed=None, instructions="", id=None, assignee=None):
+        self.id = id # Stable identifier used by the API; see assign_ids()
+        self.name = name
+        self.value = value
+        self.frequency = frequency if frequency.__class__ is Frequency else Frequency.parse(frequency)
+        self.last_completed = last_completed # datetime or None
+        self.instructions = instructions
+        self.assignee = assignee # Who the chore belongs to within the household, or None for anyone
+
+    def __repr__(self):
+        return f"Chore({self.name!r}, {self.value!r}, {self.frequency.value!r}, last_completed={self.last_completed!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Chore):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def copy(self):
+        clone = Chore.__new__(Chore) # Skips re-validating the frequency
+        clone.id = self.id
+        clone.name = self.name
+        clone.value = self.value
+        clone.frequency = self.frequency
+        clone.last_completed = self.last_completed
+        clone.instructions = self.instructions
+        clone.assignee = self.assignee
+        return clone
+
+    def to_json(self):
+        """The chore as a JSON-ready dict, in the chore_data.json format."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "value": self.value,
+            "frequency": self.frequency.value,
+            "last_completed": self.last_completed.isoformat() if self.last_completed else None,
+            "instructions": self.instructions,
+            "assignee": self.assignee,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Builds a chore from a chore_data.json record, normalizing legacy files:
+        old frequency names, missing instructions and date-only `last_completed`
+        strings written by earlier versions of complete_chore.
+        """
+        last_completed = data.get('last_completed')
+        if isinstance(last_completed, str):
+            last_completed = datetime.fromisoformat(last_completed)
+        return cls(data['name'], int(data['value']), data['frequency'], last_completed or None,
+                   data.get('instructions') or "", data.get('id'), data.get('assignee') or None)
+
+
+def slugify(name):
+    """"Load/Unload Dishwasher" -> "load-unload-dishwasher"."""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or "chore"
+
+
+def assign_ids(chores):
+    """
+    Gives every chore without an id a stable one derived from its name, so
+    legacy files get the same ids in every process until they are saved.
+    """
+    taken = {chore.id for chore in chores if chore.id}
+    for chore in chores:
+        if not chore.id:
+            base = candidate = slugify(chore.name)
+            suffix = 2
+            while candidate in taken:
+                candidate = f"{base}-{suffix}"
+                suffix += 1
+            chore.id = candidate
+            taken.add(candidate)
+    return chores
@@ -0,0 +1,162 @@
+"""
+Period rollover for statuses and points.
+
+Statuses only change when a chore is completed or when a period boundary
+passes: midnight (daily chores, and the rolling 14-day bi-weekly window),
+Monday (weekly) and the first of the month (ad-hoc points). RolloverScheduler
+keeps one precomputed StatusSnapshot and recomputes it at exactly those
+moments, so requests only ever read it. Nothing is written to disk on a
+rollover: statuses are derived from last_completed, so there is nothing to
+reset.
+
+The clock is injectable, so rollovers can be driven deterministically:
+
+    now = [datetime(2025, 1, 5, 23, 59)]
+    schedule = RolloverScheduler(store, clock=lambda: now[0])
+    now[0] = datetime(2025, 1, 6, 0, 0)
+    schedule.tick() # -> (snapshot, ['daily', 'weekly'])
+"""
+import threading
+from datetime import datetime, time, timedelta
+
+from chore_status import BI_WEEKLY, PeriodBoundaries, evaluate
+from metrics import cache_lookup, stage
+
+ROLLOVER_KINDS = ('daily', 'weekly', 'bi-weekly', 'monthly')
+
+
+def midnight(day):
+    return datetime.combine(day, time())
+
+
+def next_boundaries(periods, chores):
+    """
+    When each kind of period next rolls over after `periods.now`. The
+    bi-weekly boundary is the midnight at which the oldest bi-weekly chore
+    still counted as done drops out of its 14-day window (None if none is done).
+    """
+    tomorrow = midnight(periods.today + timedelta(days=1))
+    bi_weekly = None
+    for chore in chores:
+        if chore.frequency is BI_WEEKLY and chore.last_completed is not None:
+            completed_on = chore.last_completed.date()
+            if completed_on >= periods.bi_weekly_start:
+                expires = midnight(completed_on + timedelta(days=15))
+                if bi_weekly is None or expires < bi_weekly:
+                    bi_weekly = expires
+    return {
+        'daily': tomorrow,
+        'weekly': midnight(periods.next_week_start),
+        'bi-weekly': bi_weekly,
+        'monthly': midnight(periods.next_month_start),
+    }
+
+
+class StatusSnapshot:
+    """Chores with their statuses and points, as of one moment."""
+    __slots__ = ('key', 'version', 'periods', 'chores', 'statuses', 'points', 'boundaries', 'next_rollover')
+
+    def __init__(self, version, periods, chores):
+        self.version = version
+        self.periods = periods
+        self.key = (version, periods.today) # Changes on every completion and every rollover
+        self.chores = chores
+        with stage('status'):
+            self.statuses, self.points = evaluate(chores, periods.now)
+            self.boundaries = next_boundaries(periods, chores)
+        self.next_rollover = min(boundary for boundary in self.boundaries.values() if boundary is not None)
+
+
+class RolloverScheduler:
+    """
+    Owns the current StatusSnapshot of a store and rolls it over at period
+    boundaries, either from a background thread (start()) or by calling tick().
+    """
+
+    def __init__(self, store, clock=datetime.now, max_sleep=60.0):
+        self.store = store
+        self.clock = clock
+        self.max_sleep = max_sleep # Re-check at least this often, in case the wall clock jumps
+        self.rollovers = 0
+        self._snapshot = None
+        self._listeners = []
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def on_rollover(self, callback):
+        """Registers callback(snapshot, kinds) to run after each rollover, e.g. to drop caches."""
+        self._listeners.append(callback)
+        return callback
+
+    def snapshot(self):
+        """
+        The current snapshot. Only recomputed when the store's version changed
+        (a completion, here or in another process) or a boundary passed
+        without the background thread noticing yet.
+        """
+        version = self.store.refresh()
+        snapshot = self._snapshot
+        if snapshot is None or self.clock() >= snapshot.next_rollover:
+            cache_lookup('status_snapshot', False)
+            return self.tick()[0]
+        if snapshot.version != version:
+            cache_lookup('status_snapshot', False)
+            return self._recompute(version)
+        cache_lookup('status_snapshot', True)
+        return snapshot
+
+    def _recompute(self, version=None):
+        with self._lock:
+            if version is None:
+                version = self.store.refresh()
+            self._snapshot = StatusSnapshot(version, PeriodBoundaries(self.clock()), self.store.load())
+            return self._snapshot
+
+    def tick(self):
+        """
+        Rolls the snapshot over if a boundary has passed. Returns (snapshot,
+        kinds), where kinds lists the periods that rolled over (empty if none).
+        """
+        with self._lock: # Only one of the thread and a request may roll over
+            previous = self._snapshot
+            if previous is None:
+                return self._recompute(), []
+            now = self.clock()
+            if now < previous.next_rollover:
+                return previous, []
+            kinds = [kind for kind in ROLLOVER_KINDS
+                     if previous.boundaries[kind] is not None and now >= previous.boundaries[kind]]
+            snapshot = self._recompute()
+            self.rollovers += 1
+            for callback in self._listeners:
+                callback(snapshot, kinds)
+            return snapshot, kinds
+
+    def invalidate(self):
+        """Drops the snapshot, so the next snapshot() recomputes it from the store."""
+        with self._lock:
+            self._snapshot = None
+
+    def seconds_until_rollover(self):
+        snapshot = self._snapshot or self._recompute()
+        return max((snapshot.next_rollover - self.clock()).total_seconds(), 0.0)
+
+    def run(self):
+        """Sleeps until each boundary and rolls over; returns once stop() is called."""
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(min(self.seconds_until_rollover(), self.max_sleep))
+
+    def start(self):
+        """Runs the scheduler on a daemon thread (once per process)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name='chore-rollover', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,147 @@
+"""
+Encoding of the chore data file and journal lines.
+
+Three snapshot formats are written, picked with CHORE_DATA_FORMAT:
+
+- `compact` (default): {"format": 2, "chores": [[id, name, value, ...], ...]},
+  one array per chore and timestamps as integer microseconds, so loading
+  skips a dict and a datetime.fromisoformat() per chore.
+- `binary`: the compact payload, zlib-compressed behind a short header; a
+  fraction of the size on disk for very large charts.
+- `pretty`: the original indented list of dicts with ISO timestamps, for
+  people who edit chore_data.json by hand.
+
+All three, plus files written by earlier versions, are recognised when
+reading, so switching formats only takes effect on the next save. orjson is
+used when it's installed, the json module otherwise.
+
+Timestamps are the naive local times the app works in, counted in
+microseconds from 1970-01-01 00:00 with no time zone conversion, so they
+round-trip exactly.
+"""
+import gc
+import json
+import os
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from chore_model import FREQUENCY_LOOKUP, Chore
+
+try:
+    import orjson
+except ImportError: # Optional: pip install orjson
+    orjson = None
+
+FORMATS = ('compact', 'binary', 'pretty')
+DEFAULT_FORMAT = os.environ.get('CHORE_DATA_FORMAT', 'compact')
+COMPACT_VERSION = 2
+BINARY_MAGIC = b'CHORES\x00\x02'
+# Order of the fields in a compact chore row
+ROW_FIELDS = ('id', 'name', 'value', 'frequency', 'last_completed', 'instructions', 'assignee')
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# What decode_chores() raises for a damaged file
+DecodeError = (ValueError, zlib.error)
+
+
+def to_timestamp(moment):
+    """Naive datetime -> integer microseconds since 1970-01-01 00:00."""
+    return (moment - EPOCH) // MICROSECOND
+
+
+def from_timestamp(value):
+    return EPOCH + timedelta(microseconds=value)
+
+
+@contextmanager
+def gc_paused():
+    """
+    Holds off the cyclic garbage collector while a whole chart's worth of
+    objects is built: none of them are garbage, but every few hundred
+    allocations would otherwise trigger a collection pass over them.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def dumps(obj):
+    """Compact JSON as bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def chore_to_row(chore):
+    last_completed = chore.last_completed
+    return [chore.id, chore.name, chore.value, chore.frequency.value,
+            to_timestamp(last_completed) if last_completed is not None else None,
+            chore.instructions, chore.assignee]
+
+
+def chore_from_row(row):
+    chore = Chore.__new__(Chore) # Rows come from our own files, so skip re-validation
+    chore.id, chore.name, chore.value, frequency, last_completed, chore.instructions, chore.assignee = row
+    chore.frequency = FREQUENCY_LOOKUP[frequency]
+    chore.last_completed = from_timestamp(last_completed) if last_completed is not None else None
+    return chore
+
+
+def encode_chores(chores, data_format=None):
+    """The data file contents (bytes) for a chore list."""
+    data_format = data_format or DEFAULT_FORMAT
+    if data_format not in FORMATS:
+        raise ValueError(f"Unknown chore data format {data_format!r}; expected one of {', '.join(FORMATS)}")
+    with gc_paused():
+        if data_format == 'pretty':
+            return json.dumps([chore.to_json() for chore in chores], indent=4).encode('utf-8')
+        data = dumps({"format": COMPACT_VERSION, "fields": ROW_FIELDS,
+                      "chores": [chore_to_row(chore) for chore in chores]})
+    if data_format == 'binary':
+        return BINARY_MAGIC + zlib.compress(data, 1)
+    return data
+
+
+def decode_chores(data):
+    """Chores from data file contents in any format, including legacy chore_data.json files."""
+    if data.startswith(BINARY_MAGIC):
+        data = zlib.decompress(data[len(BINARY_MAGIC):])
+    with gc_paused():
+        parsed = loads(data)
+        if isinstance(parsed, list): # The pretty format, and every file from before compact existed
+            return [Chore.from_json(chore) for chore in parsed]
+        if parsed.get("format") != COMPACT_VERSION:
+            raise ValueError(f"Unsupported chore data format version {parsed.get('format')!r}")
+        return [chore_from_row(row) for row in parsed["chores"]]
+
+
+def encode_completion(name, completed_at, by=None):
+    """One journal item (bytes); a line holds one item, or {"batch": [items]}. `by` is who did it, if known."""
+    if by is None:
+        return dumps({"name": name, "at": to_timestamp(completed_at)})
+    return dumps({"name": name, "at": to_timestamp(completed_at), "by": by})
+
+
+def decode_completion(item, with_by=False):
+    """
+    (name, completed_at) from a journal item, in the current or the older
+    ISO-string form; with_by=True adds who did it (None if not recorded).
+    """
+    at = item.get('at')
+    completed_at = from_timestamp(at) if at is not None else datetime.fromisoformat(item['completed_at'])
+    if with_by:
+        return item['name'], completed_at, item.get('by')
+    return item['name'], completed_at
@@ -0,0 +1,369 @@
+"""
+SQLite storage backend for the chore chart.
+
+Every completion is kept as a row in `completions`, indexed on
+(chore_id, completed_at), so per-chore history queries stay fast no matter
+how many years of history pile up. `chores.last_completed` is a
+denormalized copy of the latest completion so loading the chart never has
+to touch the history table.
+
+To move an existing chart over:
+    python chore_sqlite.py chore_data.json chore_data.db
+"""
+import argparse
+import sqlite3
+import threading
+from datetime import datetime
+
+from chore_model import Chore, Frequency, assign_ids
+from chore_status import DONE
+from chore_store import ChoreStore, JsonChoreStore
+from metrics import WRITES, cache_lookup, stage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chores (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    slug TEXT,
+    name TEXT NOT NULL UNIQUE,
+    value INTEGER NOT NULL,
+    frequency TEXT NOT NULL,
+    instructions TEXT,
+    last_completed TEXT,
+    assignee TEXT
+);
+CREATE TABLE IF NOT EXISTS completions (
+    id INTEGER PRIMARY KEY,
+    chore_id INTEGER NOT NULL REFERENCES chores(id) ON DELETE CASCADE,
+    completed_at TEXT NOT NULL,
+    done_by TEXT
+);
+CREATE INDEX IF NOT EXISTS completions_by_chore_time ON completions (chore_id, completed_at);
+CREATE INDEX IF NOT EXISTS completions_by_time ON completions (completed_at);
+"""
+
+# Run after SCHEMA, once older databases have been given the columns they lack
+INDEXES = """
+CREATE UNIQUE INDEX IF NOT EXISTS chores_by_slug ON chores (slug);
+"""
+
+
+def to_db_time(moment):
+    """Fixed-width ISO timestamps, so text comparison in SQL matches time order."""
+    return moment.isoformat(timespec='microseconds')
+
+
+class SqliteChoreStore(ChoreStore):
+    """
+    Chores and their full completion history in a SQLite database (WAL mode).
+    Each thread gets its own connection; the chore list is cached in memory and
+    only re-read when another connection has written to the database.
+    """
+
+    def __init__(self, path, default_factory=list):
+        self.path = path
+        self.default_factory = default_factory
+        self.version = 0
+        self._chores = None
+        self._by_id = {}
+        self._local = threading.local() # Per-thread connection and last seen data_version
+        self._lock = threading.Lock()
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(chores)")}
+            if 'slug' not in columns:
+                conn.execute("ALTER TABLE chores ADD COLUMN slug TEXT")
+            if 'assignee' not in columns:
+                conn.execute("ALTER TABLE chores ADD COLUMN assignee TEXT")
+            if 'done_by' not in {row[1] for row in conn.execute("PRAGMA table_info(completions)")}:
+                conn.execute("ALTER TABLE completions ADD COLUMN done_by TEXT")
+            conn.executescript(INDEXES)
+            empty = conn.execute("SELECT COUNT(*) FROM chores").fetchone()[0] == 0
+        if empty:
+            defaults = self.default_factory()
+            if defaults:
+                self.save(defaults)
+
+    def _connection(self):
+        """Returns this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL") # Durable with WAL, without an fsync per commit
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            self._local.data_version = None
+        return conn
+
+    @staticmethod
+    def _row_to_chore(row):
+        slug, name, value, frequency, instructions, last_completed, assignee = row
+        return Chore(name, value, frequency, datetime.fromisoformat(last_completed) if last_completed else None,
+                     instructions or "", slug, assignee)
+
+    def _refresh(self):
+        """Re-queries the chore list if another connection wrote. Caller holds self._lock."""
+        conn = self._connection()
+        # data_version changes when *another* connection commits; our own writes update the cache directly
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._chores is None or data_version != self._local.data_version:
+            cache_lookup('store', False)
+            with stage('load'):
+                rows = conn.execute(
+                    "SELECT slug, name, value, frequency, instructions, last_completed, assignee"
+                    " FROM chores ORDER BY position"
+                ).fetchall()
+                # Rows from before ids existed get derived ones until the next save()
+                self._chores = assign_ids([self._row_to_chore(row) for row in rows])
+            self._by_id = {chore.id: chore for chore in self._chores}
+            self._local.data_version = data_version
+            self.version += 1
+        else:
+            cache_lookup('store', True)
+
+    def load(self):
+        """Returns a copy of the chore list, re-querying only if another connection wrote."""
+        with self._lock:
+            self._refresh()
+            return [chore.copy() for chore in self._chores]
+
+    def refresh(self):
+        with self._lock:
+            self._refresh()
+            return self.version
+
+    def find(self, chore_id):
+        with self._lock:
+            self._refresh()
+            chore = self._by_id.get(chore_id)
+            return chore.copy() if chore is not None else None
+
+    def save(self, chores):
+        """
+        Replaces the chore list in one transaction. Rows are matched by id
+        (the slug), so a renamed chore keeps its history; chores that
+        disappeared are deleted along with theirs. A `last_completed` that
+        isn't in the history yet is recorded as a completion; one that is older
+        than the stored one (the caller loaded before another connection
+        completed the chore) is moved forward instead of overwriting it.
+        """
+        self._replace(lambda: chores)
+
+    def update_chores(self, change):
+        """Runs change(chores) on the chore list as stored and saves the result, in one transaction."""
+        results = []
+        def changed():
+            self._chores = None # Re-read inside the transaction, so no other write can slip in between
+            self._refresh()
+            chores = [chore.copy() for chore in self._chores]
+            results.append(change(chores))
+            return chores
+        self._replace(changed)
+        return results[0]
+
+    def _replace(self, get_chores):
+        """save() and update_chores(): writes the list get_chores() returns once the write lock is held."""
+        conn = self._connection()
+        with self._lock, stage('persist'):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                chores = assign_ids(get_chores())
+                # Rows from before ids existed take the id load() derived for them
+                if conn.execute("SELECT 1 FROM chores WHERE slug IS NULL LIMIT 1").fetchone():
+                    conn.executemany(
+                        "UPDATE chores SET slug = ? WHERE name = ? AND slug IS NULL"
+                        " AND NOT EXISTS (SELECT 1 FROM chores WHERE slug = ?)",
+                        ((chore.id, chore.name, chore.id) for chore in chores))
+                stored = {slug: (name, last_completed) for slug, name, last_completed
+                          in conn.execute("SELECT slug, name, last_completed FROM chores")}
+                wanted = {chore.id for chore in chores}
+                conn.executemany("DELETE FROM chores WHERE slug IS ?",
+                                 ((slug,) for slug in stored if slug not in wanted))
+                # Move renamed chores' old names aside, so swapping two names can't trip UNIQUE(name)
+                conn.executemany("UPDATE chores SET name = char(0) || slug WHERE slug = ?",
+                                 ((chore.id,) for chore in chores
+                                  if stored.get(chore.id, (chore.name,))[0] != chore.name))
+                for position, chore in enumerate(chores):
+                    stored_at = stored.get(chore.id, (None, None))[1]
+                    if stored_at is not None:
+                        stored_at = datetime.fromisoformat(stored_at)
+                        if chore.last_completed is None or chore.last_completed < stored_at:
+                            chore.last_completed = stored_at
+                    last_completed = chore.last_completed
+                    conn.execute(
+                        "INSERT INTO chores"
+                        " (position, slug, name, value, frequency, instructions, last_completed, assignee)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                        " ON CONFLICT(slug) DO UPDATE SET position=excluded.position, name=excluded.name,"
+                        " value=excluded.value,"
+                        " frequency=excluded.frequency, instructions=excluded.instructions,"
+                        " last_completed=excluded.last_completed, assignee=excluded.assignee",
+                        (position, chore.id, chore.name, chore.value, chore.frequency.value,
+                         chore.instructions, to_db_time(last_completed) if last_completed else None,
+                         chore.assignee))
+                    if last_completed:
+                        conn.execute(
+                            "INSERT INTO completions (chore_id, completed_at)"
+                            " SELECT id, last_completed FROM chores c WHERE slug = ? AND NOT EXISTS"
+                            " (SELECT 1 FROM completions WHERE chore_id = c.id AND completed_at = c.last_completed)",
+                            (chore.id,))
+                conn.execute("COMMIT")
+                WRITES.inc('sqlite_transaction')
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self._chores = [chore.copy() for chore in chores]
+            self._by_id = {chore.id: chore for chore in self._chores}
+            self.version += 1
+
+    def record_completions(self, events, skip_if_done=None, skipped=None):
+        """
+        Records many (name, completed_at) or (name, completed_at, by) completions
+        in a single transaction. Returns how many matched a chore. skip_if_done is checked against the
+        rows inside the transaction; see ChoreStore.record_completions().
+        """
+        if self._chores is None:
+            self.load()
+        conn = self._connection()
+        recorded = 0
+        with self._lock, stage('persist'):
+            by_name = {chore.name: chore for chore in self._chores or []}
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for event in events:
+                    name, completed_at = event[0], event[1]
+                    if skip_if_done is not None:
+                        row = conn.execute("SELECT frequency, last_completed FROM chores WHERE name = ?",
+                                           (name,)).fetchone()
+                        if row is None:
+                            continue
+                        frequency, last_completed = row
+                        completed_on = datetime.fromisoformat(last_completed).date() if last_completed else None
+                        if skip_if_done.status(Frequency.parse(frequency), completed_on) == DONE:
+                            if skipped is not None:
+                                skipped.append(name)
+                            continue
+                    stamp = to_db_time(completed_at)
+                    cursor = conn.execute(
+                        "INSERT INTO completions (chore_id, completed_at, done_by)"
+                        " SELECT id, ?, ? FROM chores WHERE name = ?",
+                        (stamp, event[2] if len(event) > 2 else None, name))
+                    if cursor.rowcount == 0:
+                        continue
+                    conn.execute(
+                        "UPDATE chores SET last_completed = ? WHERE name = ?"
+                        " AND (last_completed IS NULL OR last_completed < ?)", (stamp, name, stamp))
+                    chore = by_name.get(name)
+                    if chore is not None and (chore.last_completed is None or chore.last_completed < completed_at):
+                        chore.last_completed = completed_at
+                    recorded += 1
+                conn.execute("COMMIT")
+                WRITES.inc('sqlite_transaction')
+            except BaseException:
+                conn.execute("ROLLBACK")
+                self._chores = None
+                raise
+            self.version += 1
+        return recorded
+
+    def completions(self, name=None, since=None, until=None):
+        """Indexed history query: (name, completed_at) pairs in time order."""
+        clauses, params = [], []
+        if name is not None:
+            clauses.append("c.name = ?")
+            params.append(name)
+        if since is not None:
+            clauses.append("h.completed_at >= ?")
+            params.append(to_db_time(since))
+        if until is not None:
+            clauses.append("h.completed_at < ?")
+            params.append(to_db_time(until))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection().execute(
+            "SELECT c.name, h.completed_at FROM completions h JOIN chores c ON c.id = h.chore_id"
+            f"{where} ORDER BY h.completed_at", params).fetchall()
+        return [(row[0], datetime.fromisoformat(row[1])) for row in rows]
+
+    def completions_since(self, cursor=0):
+        """The cursor is the id of the last completion row returned."""
+        rows = self._connection().execute(
+            "SELECT c.name, h.completed_at, h.id FROM completions h JOIN chores c ON c.id = h.chore_id"
+            " WHERE h.id > ? ORDER BY h.id", (cursor,)).fetchall()
+        if not rows:
+            return [], cursor
+        return [(row[0], datetime.fromisoformat(row[1])) for row in rows], rows[-1][2]
+
+    def iter_completions(self, with_by=False):
+        """Streams rows off the cursor in the order they were recorded, one consistent WAL snapshot."""
+        rows = self._connection().execute(
+            "SELECT c.name, h.completed_at, h.done_by FROM completions h JOIN chores c ON c.id = h.chore_id"
+            " ORDER BY h.id")
+        for name, completed_at, by in rows:
+            if with_by:
+                yield name, datetime.fromisoformat(completed_at), by
+            else:
+                yield name, datetime.fromisoformat(completed_at)
+
+    def last_completion(self, name, before=None):
+        """The most recent completion of one chore (optionally before a time), or None."""
+        sql = ("SELECT h.completed_at FROM completions h JOIN chores c ON c.id = h.chore_id"
+               " WHERE c.name = ?")
+        params = [name]
+        if before is not None:
+            sql += " AND h.completed_at < ?"
+            params.append(to_db_time(before))
+        row = self._connection().execute(sql + " ORDER BY h.completed_at DESC LIMIT 1", params).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def sync(self):
+        """Checkpoints the WAL into the main database file."""
+        self._connection().execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def invalidate(self):
+        with self._lock:
+            self._chores = None
+
+    def close(self):
+        """Closes this thread's connection; other threads' close when the store is collected."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def migrate_json_to_sqlite(json_path, db_path):
+    """
+    One-shot copy of a chore_data.json chart (snapshot, journal and history)
+    into a new SQLite database. Returns (chores, completions) copied.
+    """
+    source = JsonChoreStore(json_path)
+    chores = source.load()
+    if not chores:
+        raise ValueError(f"No chores found in {json_path}")
+    target = SqliteChoreStore(db_path)
+    if target.load():
+        raise ValueError(f"{db_path} already has chores; refusing to migrate over them")
+    # Insert history first, then the snapshot: save() only adds last_completed if it's missing
+    blank = [chore.copy() for chore in chores]
+    for chore in blank:
+        chore.last_completed = None
+    target.save(blank)
+    # In time order, keeping who did each one
+    events = sorted(source.iter_completions(with_by=True), key=lambda event: event[1])
+    target.record_completions(events)
+    target.save(chores)
+    return len(chores), len(target.completions())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy a JSON chore chart into a SQLite database.")
+    parser.add_argument('json_path', help="existing chore_data.json")
+    parser.add_argument('db_path', help="SQLite database to create (e.g. chore_data.db)")
+    args = parser.parse_args()
+    chores, completions = migrate_json_to_sqlite(args.json_path, args.db_path)
+    print(f"Migrated {chores} chores and {completions} completions into {args.db_path}")
+
+
+if __name__ == '__main__':
+    main()
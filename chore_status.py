@@ -0,0 +1,76 @@
+"""
+Chore status and points, computed from a single "now".
+
+The period boundaries (today, this ISO week, the last 14 days, this month)
+are worked out once per request in PeriodBoundaries, and every chore is then
+classified with plain date comparisons. Because everything hangs off one
+`now`, statuses and points can't disagree if midnight passes mid-render.
+"""
+from datetime import datetime, timedelta
+
+from chore_model import Frequency
+
+DONE = "DONE"
+PENDING = "PENDING"
+NOT_RECURRING = "Not Recurring"
+UNKNOWN = "Unknown"
+
+# Enum attribute lookups are slow enough to show up at 10k chores, so look them up once
+DAILY, WEEKLY, BI_WEEKLY, AD_HOC = Frequency.DAILY, Frequency.WEEKLY, Frequency.BI_WEEKLY, Frequency.AD_HOC
+
+
+class PeriodBoundaries:
+    """The current daily, ISO-week, 14-day and monthly windows as date ranges."""
+
+    def __init__(self, now=None):
+        self.now = now or datetime.now()
+        today = self.now.date()
+        self.today = today
+        # Comparing dates against the Monday that starts the ISO week avoids the old
+        # week-number/calendar-year check, which broke for weeks spanning New Year
+        self.week_start = today - timedelta(days=today.weekday())
+        self.next_week_start = self.week_start + timedelta(days=7)
+        # Bi-weekly chores are done if completed within the last 14 days
+        self.bi_weekly_start = today - timedelta(days=14)
+        self.month_start = today.replace(day=1)
+        self.next_month_start = (self.month_start + timedelta(days=32)).replace(day=1)
+
+    def status(self, frequency, completed_on):
+        """Classifies one chore, given its frequency and the date it was last completed (or None)."""
+        if frequency is DAILY:
+            return DONE if completed_on == self.today else PENDING
+        if frequency is WEEKLY:
+            return DONE if completed_on and self.week_start <= completed_on < self.next_week_start else PENDING
+        if frequency is BI_WEEKLY:
+            return DONE if completed_on and completed_on >= self.bi_weekly_start else PENDING
+        if frequency is AD_HOC:
+            return NOT_RECURRING
+        return UNKNOWN
+
+    def done_this_month(self, completed_on):
+        return completed_on is not None and self.month_start <= completed_on < self.next_month_start
+
+
+def chore_status(chore, periods):
+    """Status of a single chore within the given periods."""
+    last_completed = chore.last_completed
+    return periods.status(chore.frequency, last_completed.date() if last_completed else None)
+
+
+def evaluate(chores, now=None):
+    """
+    Classifies every chore in one pass. Returns (statuses, points), where
+    statuses lines up with `chores` and points is the total earned this period:
+    recurring chores that are DONE, plus ad-hoc chores completed this month.
+    """
+    periods = PeriodBoundaries(now)
+    statuses = []
+    points = 0
+    for chore in chores:
+        last_completed = chore.last_completed
+        completed_on = last_completed.date() if last_completed else None
+        status = periods.status(chore.frequency, completed_on)
+        statuses.append(status)
+        if status == DONE or (status == NOT_RECURRING and periods.done_this_month(completed_on)):
+            points += chore.value
+    return statuses, points
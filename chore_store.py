@@ -0,0 +1,614 @@
+import atexit
+import os
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from chore_model import assign_ids
+from chore_serialization import (DEFAULT_FORMAT, DecodeError, decode_chores, decode_completion, encode_chores,
+                                 encode_completion, dumps, gc_paused, loads)
+from chore_status import DONE, chore_status
+from metrics import WRITES, cache_lookup, stage
+
+try:
+    import fcntl
+except ImportError: # Windows: no cross-process locking, single-process use only
+    fcntl = None
+
+
+def parse_journal(data, with_by=False):
+    """
+    Yields (name, completed_at) from the complete lines of journal bytes, or
+    (name, completed_at, by) with with_by=True. A line is either one completion
+    or a batch of them written by record_completions(), or the history mark
+    that starts a journal (see JsonChoreStore._history_size()).
+    """
+    for line in data[:data.rfind(b'\n') + 1].splitlines():
+        try:
+            event = loads(line)
+        except ValueError:
+            continue # Skip a line left half-written by a crash
+        if 'history' in event:
+            continue
+        for item in event.get('batch', (event,)):
+            yield decode_completion(item, with_by)
+
+
+def file_mode(path):
+    """Permission bits of `path`, or what a new file gets under the current umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def file_lock(path, exclusive=True):
+    """Holds an advisory lock on `path` (created if missing) for the duration of the block."""
+    with open(path, 'a') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class ChoreStore:
+    """
+    Storage interface behind load_chores()/save_chores(). Chores are
+    chore_model.Chore objects; every completion is also kept as history.
+    """
+    version = 0 # Bumped every time the chores change, in this process or another
+
+    def load(self):
+        """Returns a copy of the current chore list."""
+        raise NotImplementedError
+
+    def save(self, chores):
+        """Replaces the stored chore list."""
+        raise NotImplementedError
+
+    def update_chores(self, change):
+        """
+        Read-modify-write of the chore list: calls change(chores) on a copy of
+        the list as stored, saves the list it leaves behind and returns what
+        change() returned. Holds the write lock throughout, so edits made at
+        the same time by other processes aren't lost.
+        """
+        raise NotImplementedError
+
+    def find(self, chore_id):
+        """Returns a copy of the chore with this stable id (a hash lookup), or None."""
+        raise NotImplementedError
+
+    def record_completion(self, name, completed_at, by=None):
+        """Marks a chore complete (by someone, if given). Returns False if there is no such chore."""
+        return self.record_completions([(name, completed_at, by)]) == 1
+
+    def record_completions(self, events, skip_if_done=None, skipped=None):
+        """
+        Records many (name, completed_at) completions as one transaction with a
+        single write to disk. An event can also be (name, completed_at, by) to
+        record who did the chore; `by` is kept in the history and nowhere else.
+        `events` can be a generator; it is consumed as it is written, so a
+        large import takes constant memory. Returns how many matched a chore.
+
+        With skip_if_done (a chore_status.PeriodBoundaries), completions of
+        chores that are already DONE in those periods are left out, and their
+        names appended to the `skipped` list if one is passed. The check runs
+        under the write lock, against the stored chores and the batch's earlier
+        events, so two requests can't both complete the same chore.
+        """
+        raise NotImplementedError
+
+    def completions(self, name=None, since=None, until=None):
+        """Returns (name, completed_at) pairs in time order, optionally filtered."""
+        raise NotImplementedError
+
+    def completions_since(self, cursor=0):
+        """
+        Returns (events, cursor): the (name, completed_at) completions recorded
+        after `cursor`, in the order they were written, and the cursor to pass
+        next time. Cursor 0 reads the whole history.
+        """
+        raise NotImplementedError
+
+    def iter_completions(self, with_by=False):
+        """
+        Yields every (name, completed_at) in the order they were recorded,
+        without loading them all; with_by=True yields (name, completed_at, by).
+        """
+        if with_by:
+            return ((name, completed_at, None) for name, completed_at in self.completions_since(0)[0])
+        return iter(self.completions_since(0)[0])
+
+    def refresh(self):
+        """Picks up changes made by other processes and returns the current version."""
+        raise NotImplementedError
+
+    def sync(self):
+        """Makes sure everything written so far is on disk."""
+
+    def invalidate(self):
+        """Forces the next load() to re-read from disk."""
+
+    def close(self):
+        """Flushes and releases open files or connections, e.g. when a household is evicted."""
+        self.sync()
+
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+
+def open_store(path, default_factory=list):
+    """Opens the storage backend that matches the file extension of `path`."""
+    if path.endswith(SQLITE_EXTENSIONS):
+        from chore_sqlite import SqliteChoreStore
+        return SqliteChoreStore(path, default_factory=default_factory)
+    return JsonChoreStore(path, default_factory=default_factory)
+
+
+class JsonChoreStore(ChoreStore):
+    """
+    Keeps the chore list in memory and writes changes straight through to disk.
+
+    On disk the chores live in a snapshot (the JSON data file) plus an
+    append-only journal of completions next to it (`<data file>.journal`).
+    Completing a chore appends one line to the journal; once enough events
+    pile up, they are compacted back into the snapshot, which is always
+    replaced atomically, and the compacted events are appended to
+    `<data file>.history` so no completion is ever lost. A lock file
+    (`<data file>.lock`) serializes writers across processes.
+
+    The files are only re-read when their inode, size or modification time
+    change, so other processes (the CLI, other gunicorn workers) stay in sync.
+    """
+
+    def __init__(self, path, default_factory=list, compact_every=500, fsync_every=16, fsync_interval=1.0,
+                 data_format=None):
+        self.path = path
+        self.journal_path = path + '.journal'
+        self.history_path = path + '.history'
+        self.lock_path = path + '.lock'
+        self.default_factory = default_factory
+        self.data_format = data_format or DEFAULT_FORMAT # How the snapshot is written; any format is read
+        self.compact_every = compact_every # Journal events before folding them into the snapshot
+        self.fsync_every = fsync_every # Appends per fsync...
+        self.fsync_interval = fsync_interval # ...or seconds since the last one, whichever comes first
+        self.version = 0 # Bumped every time the in-memory chores change
+        self._chores = None
+        self._by_name = {}
+        self._by_id = {}
+        self._signature = None
+        self._journal_offset = 0 # Bytes of the journal already applied
+        self._journal_events = 0
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+        self._sync_timer = None # Pending fsync of the last appends, see _maybe_fsync()
+        self._journal_file = None
+        self._lock = threading.Lock()
+        atexit.register(self.sync)
+
+    def _stat(self, path):
+        """Returns a cheap fingerprint of a file, or None if it doesn't exist."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _stat_signature(self):
+        return (self._stat(self.path), self._stat(self.journal_path))
+
+    def _read_snapshot(self):
+        """Reads and parses the snapshot, falling back to the default chores."""
+        try:
+            with open(self.path, 'rb') as f:
+                return decode_chores(f.read())
+        except FileNotFoundError:
+            return self.default_factory()
+        except DecodeError:
+            print(f"Error reading {self.path}. Starting with the default chores.")
+            return self.default_factory()
+
+    def _replay_journal(self, offset):
+        """Applies journal events written after `offset` to the cached chores."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        # Only complete lines are applied; a torn final line is picked up once it's finished
+        for name, completed_at in parse_journal(data):
+            chore = self._by_name.get(name)
+            if chore is not None and (chore.last_completed is None or chore.last_completed < completed_at):
+                chore.last_completed = completed_at # Backfilled history never moves it back
+            self._journal_events += 1
+        self._journal_offset = offset + data.rfind(b'\n') + 1
+
+    def _refresh(self, locked=False):
+        """
+        Reloads the cached chores if the files changed since we last looked.
+        Pass locked=True when the caller already holds the file lock.
+        """
+        signature = self._stat_signature()
+        if self._chores is not None and signature == self._signature:
+            cache_lookup('store', True)
+            return
+        cache_lookup('store', False)
+        if not locked:
+            with file_lock(self.lock_path, exclusive=False):
+                self._reload()
+        else:
+            self._reload()
+        self.version += 1
+
+    def _reload(self):
+        """Re-reads whatever changed on disk: just the journal tail if possible, else everything."""
+        with stage('load'), gc_paused():
+            self._reload_files()
+
+    def _reload_files(self):
+        signature = self._stat_signature()
+        old = self._signature
+        snapshot, journal = signature
+        if (self._chores is not None and old[0] == snapshot and journal
+                and (old[1] is None or old[1][0] == journal[0]) and journal[1] >= self._journal_offset):
+            # Only the journal grew (another process completed a chore): apply the tail
+            self._replay_journal(self._journal_offset)
+        else:
+            self._set_chores(self._read_snapshot())
+            self._journal_events = 0
+            self._replay_journal(0)
+        self._signature = signature
+
+    def _set_chores(self, chores):
+        """Replaces the cached chores and rebuilds the name and id indexes."""
+        self._chores = assign_ids(chores)
+        self._by_name = {chore.name: chore for chore in chores}
+        self._by_id = {chore.id: chore for chore in chores}
+
+    def load(self):
+        """Returns a copy of the chore list, so callers can't mutate the cache."""
+        with self._lock:
+            self._refresh()
+            return [chore.copy() for chore in self._chores]
+
+    def find(self, chore_id):
+        with self._lock:
+            self._refresh()
+            chore = self._by_id.get(chore_id)
+            return chore.copy() if chore is not None else None
+
+    def refresh(self):
+        """Cheap when nothing changed: one stat() of the snapshot and the journal."""
+        with self._lock:
+            self._refresh()
+            return self.version
+
+    def _write_snapshot(self, chores):
+        """Atomically replaces the snapshot and empties the journal. Caller holds the file lock."""
+        data = encode_chores(chores, self.data_format)
+        # Archive the journal first. If we crash before emptying it, replaying it again is harmless
+        # for last_completed, and the history mark keeps the next archive from copying it twice.
+        history_size = self._archive_journal()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.chore_data.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file 0600; keep the snapshot readable by whoever could read it before
+            os.chmod(tmp_path, file_mode(self.path))
+            os.replace(tmp_path, self.path)
+            WRITES.inc('snapshot')
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # The snapshot now contains every journaled event, so the journal can go. Truncate
+        # in place rather than replacing it, so open append handles stay valid, and start
+        # the new journal with the history size it follows.
+        mark = dumps({"history": history_size}) + b'\n'
+        with open(self.journal_path, 'ab') as f:
+            f.truncate(0)
+            f.write(mark)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_offset = len(mark)
+        self._journal_events = 0
+        self._unsynced = 0
+
+    def _history_mark(self):
+        """The history size recorded on the journal's first line, or None (no journal, or an older one)."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                first = f.readline()
+        except FileNotFoundError:
+            return None
+        if not first.startswith(b'{"history":') or not first.endswith(b'\n'):
+            return None
+        return loads(first)['history']
+
+    def _history_size(self):
+        """
+        Bytes of the history file that count. A compaction that crashed after
+        archiving the journal but before emptying it leaves those lines in both
+        files; the journal's mark says where the history ended when the
+        journal was started, so the copy past it is ignored here and cut off
+        by the next archive. Caller holds the file lock.
+        """
+        size = os.path.getsize(self.history_path) if os.path.exists(self.history_path) else 0
+        mark = self._history_mark()
+        return size if mark is None else min(size, mark)
+
+    def _archive_journal(self):
+        """Appends the complete lines of the journal to the history file; returns its new size."""
+        history_size = self._history_size()
+        try:
+            with open(self.journal_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        data = data[:data.rfind(b'\n') + 1]
+        if data or os.path.exists(self.history_path):
+            with open(self.history_path, 'ab') as f:
+                f.truncate(history_size) # Drop lines a crashed compaction already copied
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            WRITES.inc('history_append')
+        return history_size + len(data)
+
+    def save(self, chores):
+        """
+        Writes the full chore list to disk (e.g. after adding a chore) and
+        updates the cache. A chore's `last_completed` never moves back: if
+        another process completed it after the caller loaded `chores`, the
+        later completion is kept (and copied into `chores`).
+        """
+        with self._lock, stage('persist'):
+            with file_lock(self.lock_path):
+                self._refresh(locked=True)
+                self._save_locked(chores)
+            self.version += 1
+
+    def update_chores(self, change):
+        with self._lock, stage('persist'):
+            with file_lock(self.lock_path):
+                self._refresh(locked=True)
+                chores = [chore.copy() for chore in self._chores]
+                result = change(chores)
+                self._save_locked(chores)
+            self.version += 1
+        return result
+
+    def _save_locked(self, chores):
+        """Writes `chores` as the new snapshot. Caller holds the file lock and has just refreshed."""
+        assign_ids(chores)
+        for chore in chores:
+            stored = self._by_id.get(chore.id)
+            if (stored is not None and stored.last_completed is not None
+                    and (chore.last_completed is None or chore.last_completed < stored.last_completed)):
+                chore.last_completed = stored.last_completed
+        self._write_snapshot(chores)
+        self._set_chores([chore.copy() for chore in chores])
+        self._signature = self._stat_signature()
+
+    def record_completions(self, events, skip_if_done=None, skipped=None):
+        """
+        Marks chores complete by appending to the journal instead of rewriting
+        the whole data file. A batch goes in as a single journal line, written
+        out as `events` is consumed, so after a crash either all of it or none
+        of it is replayed.
+        """
+        with self._lock, stage('persist'):
+            with file_lock(self.lock_path):
+                # Pick up anything other processes wrote first, so compaction can't drop it
+                self._refresh(locked=True)
+                self._drop_torn_line()
+                if self._journal_file is None or self._journal_file.closed:
+                    self._journal_file = open(self.journal_path, 'ab')
+                try:
+                    recorded, written = self._append_events(events, skip_if_done, skipped)
+                except BaseException:
+                    # The line is unfinished, so replay would skip it; cut it off and re-read the files
+                    self._journal_file.close()
+                    os.truncate(self.journal_path, self._journal_offset)
+                    self._chores = None
+                    raise
+                if not recorded:
+                    return 0
+                WRITES.inc('journal_append')
+                self._unsynced += recorded
+                self._maybe_fsync()
+                self._journal_events += recorded
+                self._journal_offset += written
+                if self._journal_events >= self.compact_every:
+                    self._write_snapshot(self._chores)
+                self._signature = self._stat_signature()
+            self.version += 1
+        return recorded
+
+    def _append_events(self, events, skip_if_done=None, skipped=None):
+        """
+        Writes the events that match a chore (and aren't skipped, see
+        record_completions()) to the journal as one line and applies them to
+        the cached chores. Returns (events, bytes) written.
+        """
+        f = self._journal_file
+        recorded = written = 0
+        first = None # Held back until we know whether this is a single event or a batch
+        for event in events:
+            name, completed_at = event[0], event[1]
+            chore = self._by_name.get(name)
+            if chore is None:
+                continue
+            if skip_if_done is not None and chore_status(chore, skip_if_done) == DONE:
+                if skipped is not None:
+                    skipped.append(name)
+                continue
+            item = encode_completion(name, completed_at, event[2] if len(event) > 2 else None)
+            if first is None:
+                first = item
+            elif recorded == 1:
+                written += f.write(b'{"batch":[' + first + b',' + item)
+            else:
+                written += f.write(b',' + item)
+            if chore.last_completed is None or chore.last_completed < completed_at:
+                chore.last_completed = completed_at
+            recorded += 1
+        if recorded == 1:
+            written += f.write(first + b'\n')
+        elif recorded:
+            written += f.write(b']}\n')
+        f.flush()
+        return recorded, written
+
+    def _drop_torn_line(self):
+        """
+        Cuts off a journal line left unfinished by a writer that crashed. Only
+        called under the exclusive file lock, so no one can still be writing it.
+        """
+        journal = self._stat(self.journal_path)
+        if journal is not None and journal[1] > self._journal_offset:
+            os.truncate(self.journal_path, self._journal_offset)
+
+    def _maybe_fsync(self):
+        """
+        fsyncs the journal once enough appends or time have accumulated. Appends
+        left unsynced are fsynced by a timer within fsync_interval, even if no
+        other completion comes along.
+        """
+        now = time.monotonic()
+        if self._unsynced >= self.fsync_every or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._journal_file.fileno())
+            WRITES.inc('journal_fsync')
+            self._unsynced = 0
+            self._last_fsync = now
+        elif self._sync_timer is None:
+            self._sync_timer = threading.Timer(self.fsync_interval, self._timed_sync)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def _timed_sync(self):
+        self._sync_timer = None
+        self.sync()
+
+    def sync(self):
+        """Flushes any journal appends that haven't been fsynced yet."""
+        with self._lock:
+            if self._unsynced and self._journal_file and not self._journal_file.closed:
+                os.fsync(self._journal_file.fileno())
+                WRITES.inc('journal_fsync')
+                self._unsynced = 0
+                self._last_fsync = time.monotonic()
+
+    def completions(self, name=None, since=None, until=None):
+        """Scans the history file and journal; use the SQLite backend for indexed queries."""
+        self.sync()
+        events = []
+        with file_lock(self.lock_path, exclusive=False):
+            history_size = self._history_size()
+            for path, size in ((self.history_path, history_size), (self.journal_path, -1)):
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read(size)
+                except FileNotFoundError:
+                    continue
+                for event_name, completed_at in parse_journal(data):
+                    if name is not None and event_name != name:
+                        continue
+                    if (since is None or completed_at >= since) and (until is None or completed_at < until):
+                        events.append((event_name, completed_at))
+        events.sort(key=lambda event: event[1])
+        return events
+
+    def completions_since(self, cursor=0):
+        """
+        The cursor is a byte offset into the history file followed by the
+        journal. Compaction moves journal lines to the end of the history
+        unchanged, so an offset stays valid across it.
+        """
+        self.sync()
+        with file_lock(self.lock_path, exclusive=False):
+            history_size = self._history_size()
+            data = b""
+            if cursor < history_size:
+                with open(self.history_path, 'rb') as f:
+                    f.seek(cursor)
+                    data = f.read(history_size - cursor)
+            try:
+                with open(self.journal_path, 'rb') as f:
+                    f.seek(max(cursor - history_size, 0))
+                    data += f.read()
+            except FileNotFoundError:
+                pass
+        data = data[:data.rfind(b'\n') + 1]
+        return list(parse_journal(data)), cursor + len(data)
+
+    def iter_completions(self, with_by=False, chunk_size=1 << 20):
+        """
+        Streams the history file and then the journal, about `chunk_size`
+        bytes at a time, through the same cursor as completions_since(), which
+        stays valid if the journal is compacted in between chunks.
+        """
+        self.sync()
+        cursor = 0
+        while True:
+            with file_lock(self.lock_path, exclusive=False):
+                history_size = self._history_size()
+                if cursor < history_size:
+                    path, offset, limit = self.history_path, cursor, history_size - cursor
+                else:
+                    path, offset, limit = self.journal_path, cursor - history_size, None
+                try:
+                    with open(path, 'rb') as f:
+                        f.seek(offset)
+                        lines = f.readlines(chunk_size) # Whole lines, however long a batch line is
+                except FileNotFoundError:
+                    lines = []
+            if limit is not None: # Stop at the end of the history that counts
+                kept = 0
+                while kept < len(lines) and limit >= len(lines[kept]):
+                    limit -= len(lines[kept])
+                    kept += 1
+                del lines[kept:]
+            if lines and not lines[-1].endswith(b'\n'):
+                lines.pop()
+            if not lines:
+                return
+            data = b"".join(lines)
+            cursor += len(data)
+            yield from parse_journal(data, with_by)
+
+    def compact(self):
+        """Folds the journal into the snapshot right away."""
+        with self._lock:
+            with file_lock(self.lock_path):
+                self._refresh(locked=True)
+                self._write_snapshot(self._chores)
+                self._signature = self._stat_signature()
+
+    def invalidate(self):
+        """Forces the next load() to re-read the data files."""
+        with self._lock:
+            self._chores = None
+
+    def close(self):
+        timer = self._sync_timer
+        if timer is not None:
+            timer.cancel()
+        self.sync()
+        with self._lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+        atexit.unregister(self.sync) # Otherwise atexit keeps every evicted store alive
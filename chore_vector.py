@@ -0,0 +1,111 @@
+"""
+Columnar, NumPy-backed status and points for many households at once.
+
+Chores are stored as parallel int64 arrays (household index, frequency code,
+point value, last completion as days since 1970-01-01), so statuses and
+per-household point totals come from a handful of vectorized comparisons and
+one grouped sum instead of a Python loop over Chore objects. Results match
+chore_status.evaluate() exactly.
+
+NumPy is optional: install it (`pip install numpy`) to use this module.
+"""
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from chore_model import Frequency
+from chore_status import DONE, NOT_RECURRING, PENDING, UNKNOWN, PeriodBoundaries
+
+DAILY, WEEKLY, BI_WEEKLY, AD_HOC, OTHER = range(5)
+FREQUENCY_CODES = {Frequency.DAILY: DAILY, Frequency.WEEKLY: WEEKLY,
+                   Frequency.BI_WEEKLY: BI_WEEKLY, Frequency.AD_HOC: AD_HOC}
+
+# Status codes index into this tuple
+STATUS_NAMES = (DONE, PENDING, NOT_RECURRING, UNKNOWN)
+STATUS_DONE, STATUS_PENDING, STATUS_NOT_RECURRING, STATUS_UNKNOWN = range(4)
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+NEVER = -(2 ** 62) # "Never completed": earlier than any window start
+
+
+def epoch_day(day):
+    """Days since 1970-01-01 for a date or datetime."""
+    return day.toordinal() - EPOCH_ORDINAL
+
+
+class ChoreColumns:
+    """Chores from one or more households as parallel int64 arrays."""
+
+    def __init__(self, households, household, frequency, value, completed_day):
+        if np is None:
+            raise ImportError("chore_vector needs NumPy: pip install numpy")
+        self.households = households # Household keys, indexed by the `household` column
+        self.household = household
+        self.frequency = frequency
+        self.value = value
+        self.completed_day = completed_day
+
+    @classmethod
+    def from_households(cls, households):
+        """Builds the columns from a mapping of household key -> list of chores."""
+        if np is None:
+            raise ImportError("chore_vector needs NumPy: pip install numpy")
+        keys = list(households)
+        count = sum(len(chores) for chores in households.values())
+
+        def column(get):
+            return np.fromiter((get(i, chore) for i, key in enumerate(keys) for chore in households[key]),
+                               dtype=np.int64, count=count)
+
+        return cls(
+            keys,
+            column(lambda i, chore: i),
+            column(lambda i, chore: FREQUENCY_CODES.get(chore.frequency, OTHER)),
+            column(lambda i, chore: chore.value),
+            column(lambda i, chore: epoch_day(chore.last_completed) if chore.last_completed else NEVER),
+        )
+
+    @classmethod
+    def from_chores(cls, chores):
+        """Builds the columns for a single household."""
+        return cls.from_households({None: chores})
+
+    def __len__(self):
+        return len(self.frequency)
+
+    def _masks(self, periods):
+        """Returns (done, ad_hoc, earned) boolean masks for the given periods."""
+        day = self.completed_day
+        frequency = self.frequency
+        today = epoch_day(periods.today)
+        done = (
+            ((frequency == DAILY) & (day == today))
+            | ((frequency == WEEKLY) & (day >= epoch_day(periods.week_start)) & (day < epoch_day(periods.next_week_start)))
+            | ((frequency == BI_WEEKLY) & (day >= epoch_day(periods.bi_weekly_start)))
+        )
+        ad_hoc = frequency == AD_HOC
+        this_month = (day >= epoch_day(periods.month_start)) & (day < epoch_day(periods.next_month_start))
+        return done, ad_hoc, done | (ad_hoc & this_month)
+
+    def status_codes(self, now=None):
+        """An int8 array of indexes into STATUS_NAMES, one per chore."""
+        done, ad_hoc, _ = self._masks(PeriodBoundaries(now))
+        codes = np.where(done, STATUS_DONE, STATUS_PENDING).astype(np.int8)
+        codes[ad_hoc] = STATUS_NOT_RECURRING
+        codes[self.frequency == OTHER] = STATUS_UNKNOWN
+        return codes
+
+    def statuses(self, now=None):
+        """Status strings, as chore_status.evaluate() would return them."""
+        return [STATUS_NAMES[code] for code in self.status_codes(now).tolist()]
+
+    def household_points(self, now=None):
+        """Points earned this period, as a dict of household key -> total."""
+        _, _, earned = self._masks(PeriodBoundaries(now))
+        totals = np.bincount(self.household, weights=np.where(earned, self.value, 0),
+                             minlength=len(self.households))
+        # Point values are integers well below 2**53, so the float sums are exact
+        return dict(zip(self.households, totals.astype(np.int64).tolist()))
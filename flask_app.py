@@ -1,37 +1,35 @@
-import json
+import cProfile
+import os
+import threading
+import time
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, redirect, url_for
+from flask import Flask, abort, g, jsonify, render_template, request, redirect, url_for
 from urllib.parse import unquote_plus, quote_plus
 
-app = Flask(__name__)
+from chore_model import Chore, Frequency
+from chore_serialization import dumps
+from chore_status import PeriodBoundaries, chore_status, evaluate
+from chore_store import open_store
+from households import Household, HouseholdRegistry
+import metrics
+from points_ledger import PERIODS, bucket_label
 
-DATA_FILE = 'chore_data.json' # File to save chore data
+app = Flask(__name__)
 
-def load_chores():
-    """Loads chore data from a JSON file."""
-    try:
-        with open(DATA_FILE, 'r') as f:
-            chores_data = json.load(f)
-            # Convert string dates back to datetime objects
-            for chore in chores_data:
-                if 'last_completed' in chore and chore['last_completed']:
-                    chore['last_completed'] = datetime.fromisoformat(chore['last_completed'])
-            return chores_data
-    except (FileNotFoundError, json.JSONDecodeError):
-        # If file not found or corrupted, initialize with default chores
-        return initialize_chores()
-
-def save_chores(chores):
-    """Saves chore data to a JSON file."""
-    # Convert datetime objects to string for JSON serialization
-    serializable_chores = []
-    for chore in chores:
-        temp_chore = chore.copy()
-        if 'last_completed' in temp_chore and temp_chore['last_completed']:
-            temp_chore['last_completed'] = temp_chore['last_completed'].isoformat()
-        serializable_chores.append(temp_chore)
-    with open(DATA_FILE, 'w') as f:
-        json.dump(serializable_chores, f, indent=4)
+# File to save chore data; point it at a .db file to use the SQLite backend instead
+DATA_FILE = os.environ.get('CHORE_DATA_FILE', 'chore_data.json')
+# CHORE_DATA_FORMAT (compact, binary or pretty) picks how JSON data files are written; see chore_serialization.py
+# Directory of per-household data files, and the extension (backend) new ones get
+HOUSEHOLDS_DIR = os.environ.get('CHORE_HOUSEHOLDS_DIR', 'households')
+HOUSEHOLD_EXTENSION = os.environ.get('CHORE_HOUSEHOLD_EXTENSION', '.json')
+HOUSEHOLD_CACHE_SIZE = int(os.environ.get('CHORE_HOUSEHOLD_CACHE_SIZE', '64')) # Households kept open per worker
+# Set to a directory to write a cProfile dump of every request there (open with snakeviz or pstats)
+app.config['PROFILE_DIR'] = os.environ.get('CHORE_PROFILE_DIR')
+# Live updates keep an /events stream open per page view, which pins a whole sync worker,
+# so they are off unless the server can afford it: gunicorn.conf.py (gthread) and
+# asgi_app.py turn them on. Flask streams end after EVENTS_MAX_SECONDS and the browser reconnects.
+app.config['LIVE_UPDATES'] = os.environ.get('CHORE_LIVE_UPDATES', '') not in ('', '0')
+app.config['EVENTS_MAX_SECONDS'] = float(os.environ.get('CHORE_EVENTS_MAX_SECONDS', '300'))
 
 def initialize_chores():
     """
@@ -39,114 +37,289 @@ def initialize_chores():
     You can customize this list!
     """
     return [
-        {"name": "Make Bed", "value": 10, "frequency": "daily", "last_completed": None, "instructions": "Make sure sheets are straight, pillows are fluffed, and blanket is neat."},
-        {"name": "Tidy Room (Clothes/Desk)", "value": 15, "frequency": "daily", "last_completed": None, "instructions": "Put away all clothes, clear surfaces, put trash in bin."},
-        {"name": "Load/Unload Dishwasher", "value": 20, "frequency": "daily", "last_completed": None, "instructions": "Scrape plates, load dishes neatly, run if full."},
-        {"name": "Take Out Kitchen Trash", "value": 5, "frequency": "daily", "last_completed": None, "instructions": "Tie bag, take to outside bin, replace kitchen bag."},
-
-        {"name": "Clean His Bathroom (Toilet, Sink, Mirror)", "value": 50, "frequency": "weekly", "last_completed": None, "instructions": "Thoroughly wipe down toilet, sink, counter, and mirror."},
-        {"name": "Vacuum Living Room", "value": 40, "frequency": "weekly", "last_completed": None, "instructions": "Clear floor of clutter, vacuum thoroughly, empty canister."},
-        {"name": "Wipe Down Kitchen Counters/Stovetop", "value": 25, "frequency": "weekly", "last_completed": None, "instructions": "Use all-purpose cleaner."},
-        {"name": "Sort & Fold Own Laundry", "value": 30, "frequency": "weekly", "last_completed": None, "instructions": "Sort by colors/types, fold neatly, put away in drawers."},
-
-        {"name": "Sweep/Blow Front/Back Patios", "value": 35, "frequency": "bi-weekly", "last_completed": None, "instructions": "Sweep away leaves, dirt, and cobwebs from designated patios."},
-        {"name": "Weed Small Front Garden Bed", "value": 60, "frequency": "bi-weekly", "last_completed": None, "instructions": "Focus on the small garden bed near the mailbox. Pull weeds by the root."},
-        {"name": "Deep Clean Shower", "value": 75, "frequency": "bi-weekly", "last_completed": None, "instructions": "Thoroughly scrub shower walls, floor, and glass. Use appropriate cleaner."},
-        {"name": "Empty All House Trash Bins", "value": 30, "frequency": "bi-weekly", "last_completed": None, "instructions": "Empty all small trash cans in bedrooms, bathrooms, office. Replace liners."},
-
-        {"name": "Mow Front Lawn", "value": 100, "frequency": "ad_hoc", "last_completed": None, "instructions": "Mow the front lawn carefully. Ask for help with edges if needed. (Requires adult supervision)."},
-        {"name": "Wash Car (Exterior)", "value": 80, "frequency": "ad_hoc", "last_completed": None, "instructions": "Soap, rinse, and dry car exterior."},
-        {"name": "Clean Out Refrigerator (Shelves)", "value": 90, "frequency": "ad_hoc", "last_completed": None, "instructions": "Remove items, wipe down one shelf section thoroughly. (Rotate section each time)."},
-        {"name": "Clean Garage (Sweep/Organize Area)", "value": 120, "frequency": "ad_hoc", "last_completed": None, "instructions": "Sweep entire garage floor, organize a designated section of the garage."},
+        Chore("Make Bed", 10, Frequency.DAILY, instructions="Make sure sheets are straight, pillows are fluffed, and blanket is neat."),
+        Chore("Tidy Room (Clothes/Desk)", 15, Frequency.DAILY, instructions="Put away all clothes, clear surfaces, put trash in bin."),
+        Chore("Load/Unload Dishwasher", 20, Frequency.DAILY, instructions="Scrape plates, load dishes neatly, run if full."),
+        Chore("Take Out Kitchen Trash", 5, Frequency.DAILY, instructions="Tie bag, take to outside bin, replace kitchen bag."),
+
+        Chore("Clean His Bathroom (Toilet, Sink, Mirror)", 50, Frequency.WEEKLY, instructions="Thoroughly wipe down toilet, sink, counter, and mirror."),
+        Chore("Vacuum Living Room", 40, Frequency.WEEKLY, instructions="Clear floor of clutter, vacuum thoroughly, empty canister."),
+        Chore("Wipe Down Kitchen Counters/Stovetop", 25, Frequency.WEEKLY, instructions="Use all-purpose cleaner."),
+        Chore("Sort & Fold Own Laundry", 30, Frequency.WEEKLY, instructions="Sort by colors/types, fold neatly, put away in drawers."),
+
+        Chore("Sweep/Blow Front/Back Patios", 35, Frequency.BI_WEEKLY, instructions="Sweep away leaves, dirt, and cobwebs from designated patios."),
+        Chore("Weed Small Front Garden Bed", 60, Frequency.BI_WEEKLY, instructions="Focus on the small garden bed near the mailbox. Pull weeds by the root."),
+        Chore("Deep Clean Shower", 75, Frequency.BI_WEEKLY, instructions="Thoroughly scrub shower walls, floor, and glass. Use appropriate cleaner."),
+        Chore("Empty All House Trash Bins", 30, Frequency.BI_WEEKLY, instructions="Empty all small trash cans in bedrooms, bathrooms, office. Replace liners."),
+
+        Chore("Mow Front Lawn", 100, Frequency.AD_HOC, instructions="Mow the front lawn carefully. Ask for help with edges if needed. (Requires adult supervision)."),
+        Chore("Wash Car (Exterior)", 80, Frequency.AD_HOC, instructions="Soap, rinse, and dry car exterior."),
+        Chore("Clean Out Refrigerator (Shelves)", 90, Frequency.AD_HOC, instructions="Remove items, wipe down one shelf section thoroughly. (Rotate section each time)."),
+        Chore("Clean Garage (Sweep/Organize Area)", 120, Frequency.AD_HOC, instructions="Sweep entire garage floor, organize a designated section of the garage."),
     ]
 
-def get_chore_status(chore):
+# One store per worker process; it re-reads DATA_FILE only when it changes on disk.
+# Statuses and points are precomputed, and only recomputed on a completion or a period rollover.
+default_household = Household(None, open_store(DATA_FILE, default_factory=initialize_chores))
+default_household.schedule.start()
+
+# Further households live under /h/<household>/..., one data file each in HOUSEHOLDS_DIR
+households = HouseholdRegistry(HOUSEHOLDS_DIR, extension=HOUSEHOLD_EXTENSION,
+                               capacity=HOUSEHOLD_CACHE_SIZE, default_factory=initialize_chores)
+
+def get_household(household_id=None):
+    """The household a request is for: the default chart, or one of the sharded ones (404 if invalid)."""
+    if household_id is None:
+        return default_household
+    try:
+        return households.get(household_id)
+    except KeyError:
+        abort(404)
+
+def load_chores(household=None):
+    """Loads chore data, served from memory unless the data file changed."""
+    return (household or default_household).store.load()
+
+def save_chores(chores, household=None):
+    """Saves chore data to the JSON file and refreshes the in-memory copy."""
+    (household or default_household).store.save(chores)
+
+def get_chore_status(chore, now=None):
     """Determines the status of a chore based on its frequency and last_completed date."""
-    today = datetime.now().date()
-    current_week_number = today.isocalendar()[1]
-    
-    if chore['frequency'] == "daily":
-        if chore['last_completed'] and chore['last_completed'].date() == today:
-            return "DONE"
-        else:
-            return "PENDING"
-    elif chore['frequency'] == "weekly":
-        if chore['last_completed'] and chore['last_completed'].isocalendar()[1] == current_week_number and chore['last_completed'].year == today.year:
-            return "DONE"
-        else:
-            return "PENDING"
-    elif chore['frequency'] == "bi-weekly":
-        # Simple bi-weekly logic: done if completed in the last 14 days
-        if chore['last_completed'] and (today - chore['last_completed'].date()).days <= 14:
-            return "DONE"
-        else:
-            return "PENDING"
-    elif chore['frequency'] == "ad_hoc":
-        # Ad-hoc chores are just displayed with their last completion date
-        return "Not Recurring"
-    return "Unknown"
+    return chore_status(chore, PeriodBoundaries(now))
 
-def calculate_points(chores):
+def calculate_points(chores, now=None):
     """Calculates points earned for chores completed in the current relevant period."""
-    today = datetime.now().date()
-    current_week_number = today.isocalendar()[1]
-    total_points_earned = 0
+    return evaluate(chores, now)[1]
 
-    for chore in chores:
-        status = get_chore_status(chore)
-        if status == "DONE":
-            total_points_earned += chore['value']
-        elif chore['frequency'] == "ad_hoc" and chore['last_completed'] and chore['last_completed'].month == today.month and chore['last_completed'].year == today.year:
-             total_points_earned += chore['value'] # Count ad-hoc if done this month
+def cached_response(body, etag, mimetype='text/html'):
+    """Sends a cached page, or a bodyless 304 if the browser already has this version."""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype=mimetype)
+    response.set_etag(etag)
+    # Browsers may keep the page but must check back; unchanged pages cost a 304
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
-    return total_points_earned
-
-@app.route('/')
-def index():
-    chores = load_chores()
-    
-    # Categorize chores for display
-    daily_chores = [c for c in chores if c['frequency'] == 'daily']
-    weekly_chores = [c for c in chores if c['frequency'] == 'weekly']
-    bi_weekly_chores = [c for c in chores if c['frequency'] == 'bi-weekly']
-    ad_hoc_chores = [c for c in chores if c['frequency'] == 'ad_hoc']
-
-    # Update status for display
-    for chore_list in [daily_chores, weekly_chores, bi_weekly_chores, ad_hoc_chores]:
-        for chore in chore_list:
-            chore['display_status'] = get_chore_status(chore)
-            chore['display_last_completed'] = chore['last_completed'].strftime('%Y-%m-%d') if chore['last_completed'] else "Never"
-    
-    points_earned = calculate_points(chores)
+def render_index(snapshot, household_id=None):
+    """Renders the chart page from a chore_scheduler.StatusSnapshot."""
+    # Categorize (chore, status) pairs for display, leaving the chores themselves untouched
+    sections = {frequency: [] for frequency in Frequency}
+    for chore, status in zip(snapshot.chores, snapshot.statuses):
+        sections[chore.frequency].append((chore, status))
 
     return render_template('index.html', 
-                           daily_chores=daily_chores,
-                           weekly_chores=weekly_chores,
-                           bi_weekly_chores=bi_weekly_chores,
-                           ad_hoc_chores=ad_hoc_chores,
-                           points_earned=points_earned)
-
-@app.route('/complete/<path:chore_name>')
-def complete_chore(chore_name):
+                           household=household_id,
+                           daily_chores=sections[Frequency.DAILY],
+                           weekly_chores=sections[Frequency.WEEKLY],
+                           bi_weekly_chores=sections[Frequency.BI_WEEKLY],
+                           ad_hoc_chores=sections[Frequency.AD_HOC],
+                           points_earned=snapshot.points,
+                           live_updates=app.config['LIVE_UPDATES'])
+
+def render_api_chores(snapshot, household_id=None, assignee=None):
+    """Every chore with its current status, plus the points earned this period, as JSON."""
+    return dumps({
+        "household": household_id,
+        "points_earned": snapshot.points,
+        "chores": [dict(chore.to_json(), status=status) for chore, status in zip(snapshot.chores, snapshot.statuses)
+                   if assignee is None or chore.assignee == assignee],
+    }).decode('utf-8')
+
+def cached_page(page, render, household=None, **options):
+    """
+    Returns (body, etag) for a page, re-rendering it only when the data
+    changed or a period rolled over since it was last rendered.
+    """
+    home = household or default_household
+    snapshot = home.schedule.snapshot()
+    cache_name = (page, *sorted(options.items())) if options else page
+    cached = home.page_cache.get(cache_name, snapshot.key)
+    if cached is None:
+        with metrics.stage('render'):
+            body = render(snapshot, home.id, **options).encode('utf-8')
+        cached = home.page_cache.put(cache_name, snapshot.key, body)
+    return cached
+
+def chores_changed(household=None):
+    """Drops cached pages and wakes live-update streams after a completion."""
+    (household or default_household).changed()
+
+def complete_by_name(chore_name, household=None):
+    """Completes a chore unless it's already done for its current period."""
+    home = household or default_household
+    periods = PeriodBoundaries()
+    skipped = []
+    # Appends one journal event instead of rewriting the whole data file; the DONE check
+    # happens under the store's write lock, so a double-click can't record it twice
+    if home.store.record_completions([(chore_name, periods.now)], skip_if_done=periods, skipped=skipped):
+        home.changed()
+        app.logger.debug("Chore %r marked complete", chore_name)
+    elif skipped:
+        app.logger.debug("Chore %r is already done for its current period", chore_name)
+    else:
+        app.logger.debug("No chore named %r", chore_name)
+
+def complete_batch(payload, household=None):
+    """
+    Completes a batch of chores by id: {"ids": ["make-bed", "vacuum-living-room"]},
+    optionally with who did them: {"ids": [...], "by": "Sam"}. The whole batch is written in one transaction; if any id is unknown, nothing is.
+    Chores already done for their period are skipped and listed in `already_done`.
+    Returns (HTTP status, response dict).
+    """
+    home = household or default_household
+    ids = payload.get('ids') if isinstance(payload, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(chore_id, str) for chore_id in ids):
+        return 400, {"error": 'Expected a JSON body like {"ids": ["make-bed"]}'}
+    by = payload.get('by')
+    if by is not None and not isinstance(by, str):
+        return 400, {"error": '"by" must be a string'}
+
+    chores = {chore_id: home.store.find(chore_id) for chore_id in ids} # Hash lookups, duplicates collapse
+    unknown = [chore_id for chore_id, chore in chores.items() if chore is None]
+    if unknown:
+        return 404, {"error": "Unknown chore ids", "unknown": unknown}
+
+    periods = PeriodBoundaries()
+    skipped = [] # Names of chores that were already done, checked under the store's write lock
+    if home.store.record_completions([(chore.name, periods.now, by) for chore in chores.values()],
+                                     skip_if_done=periods, skipped=skipped):
+        home.changed()
+    return 200, {"completed": [chore.id for chore in chores.values() if chore.name not in skipped],
+                 "already_done": [chore.id for chore in chores.values() if chore.name in skipped]}
+
+def points_summary(period='week', count=8, household=None):
+    """
+    Points earned today, this week and this month, plus a trend of the last
+    `count` periods, all read from the ledger. Returns (HTTP status, response dict).
+    """
+    home = household or default_household
+    if period not in PERIODS:
+        return 400, {"error": f"period must be one of {', '.join(PERIODS)}"}
+    try:
+        count = int(count)
+    except (TypeError, ValueError):
+        count = 0
+    if not 1 <= count <= 366:
+        return 400, {"error": "count must be between 1 and 366"}
+    home.schedule.snapshot() # Makes sure a rollover that's due has happened
+    ledger = home.ledger
+    return 200, {
+        "today": ledger.points('day'),
+        "this_week": ledger.points('week'),
+        "this_month": ledger.points('month'),
+        "trend": [{"period": bucket_label(period, bucket), "points": points}
+                  for bucket, points in ledger.trend(period, count)],
+    }
+
+def create_household(payload):
+    """Creates a household with the default chores: {"id": "smith"}. Returns (HTTP status, response dict)."""
+    household_id = payload.get('id') if isinstance(payload, dict) else None
+    if not isinstance(household_id, str):
+        return 400, {"error": 'Expected a JSON body like {"id": "smith"}'}
+    try:
+        households.create(household_id)
+    except KeyError:
+        return 400, {"error": "Household ids are lowercase letters, digits, '-' and '_' (at most 64)"}
+    except ValueError as e:
+        return 409, {"error": str(e)}
+    return 201, {"id": household_id, "url": url_for('index', household=household_id)}
+
+@app.route('/api/households', methods=['POST'])
+def api_households():
+    status, result = create_household(request.get_json(silent=True))
+    return jsonify(result), status
+
+# cProfile can only run one profiler at a time in a process (on Python 3.12+ it is
+# process-wide), so with threaded workers only one request is profiled at a time
+profile_lock = threading.Lock()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    if app.config['PROFILE_DIR'] and profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError: # Another profiling tool is active
+            profile_lock.release()
+        else:
+            g.profiler = profiler
+
+@app.after_request
+def record_request(response):
+    """Records the request's latency."""
+    started = g.get('request_started')
+    if started is not None:
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, request.endpoint or 'unmatched', request.method)
+    return response
+
+@app.teardown_request
+def write_profile(exc):
+    """Writes the request's profile if it was profiled; runs even when the view raised."""
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return
+    try:
+        profiler.disable()
+        os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+        name = f"{datetime.now():%Y%m%dT%H%M%S.%f}-{request.endpoint or 'unmatched'}.prof"
+        profiler.dump_stats(os.path.join(app.config['PROFILE_DIR'], name))
+    finally:
+        profile_lock.release()
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Latency histograms, stage timings, cache hit counts and write counts for Prometheus."""
+    return app.response_class(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+# Every page is served both for the default chart at / and for each household under /h/<household>/
+def household_route(rule, **options):
+    def register(view):
+        app.route(rule, defaults={'household': None}, **options)(view)
+        return app.route('/h/<household>' + rule, **options)(view)
+    return register
+
+@household_route('/')
+def index(household):
+    return cached_response(*cached_page('index', render_index, get_household(household)))
+
+@household_route('/complete/<path:chore_name>')
+def complete_chore(chore_name, household):
     # Decode the URL-encoded chore name
-    decoded_chore_name = unquote_plus(chore_name)
-    print(f"Attempting to complete chore: {decoded_chore_name}")
-    
-    chores = load_chores()
-    today = datetime.now().date()
-    
-    for chore in chores:
-        if chore['name'] == decoded_chore_name:
-            current_status = get_chore_status(chore)
-            if current_status == "DONE":
-                print(f"Chore '{decoded_chore_name}' is already done for its current period.")
-            else:
-                chore['last_completed'] = today.strftime('%Y-%m-%d')
-                save_chores(chores)
-                print(f"Chore '{decoded_chore_name}' marked complete!")
-            break
-    
-    return redirect(url_for('index'))
+    complete_by_name(unquote_plus(chore_name), get_household(household))
+    return redirect(url_for('index', household=household))
+
+@household_route('/api/chores')
+def api_chores(household):
+    """Every chore with its current status (optionally only one assignee's), plus the points earned this period."""
+    options = {'assignee': request.args['assignee']} if 'assignee' in request.args else {}
+    return cached_response(*cached_page('api_chores', render_api_chores, get_household(household), **options),
+                           mimetype='application/json')
+
+@household_route('/api/completions', methods=['POST'])
+def api_completions(household):
+    """Completes a batch of chores by id; see complete_batch()."""
+    status, result = complete_batch(request.get_json(silent=True), get_household(household))
+    return jsonify(result), status
+
+@household_route('/api/points')
+def api_points(household):
+    """Points per period, e.g. /api/points?period=month&count=12; see points_summary()."""
+    status, result = points_summary(request.args.get('period', 'week'), request.args.get('count', 8),
+                                    get_household(household))
+    return jsonify(result), status
+
+@household_route('/events')
+def events(household):
+    """Server-sent events: status and points deltas as chores are completed or periods roll over."""
+    if not app.config['LIVE_UPDATES']:
+        abort(404) # EventSource gives up on a 404 instead of reconnecting
+    stream = get_household(household).live_updates.stream(max_duration=app.config['EVENTS_MAX_SECONDS'])
+    return app.response_class(stream, mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 # To run this directly without `flask run`:
 if __name__ == '__main__':
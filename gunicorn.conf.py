@@ -0,0 +1,24 @@
+"""
+gunicorn settings for flask_app.py, picked up automatically when gunicorn is
+started from the repository root:
+
+    gunicorn flask_app:app
+
+Every page view keeps an /events stream open for live updates, and a Flask
+stream occupies a worker thread for as long as it lasts. Sync workers would
+be used up by a couple of open tabs, so this runs threaded workers and only
+then turns live updates on. Serve asgi_app.py instead when you expect many
+open pages.
+"""
+import os
+
+bind = os.environ.get('CHORE_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('CHORE_WORKERS', '2'))
+worker_class = 'gthread'
+threads = int(os.environ.get('CHORE_THREADS', '32')) # Open streams + regular requests per worker
+
+raw_env = [
+    'CHORE_LIVE_UPDATES=1',
+    # Streams end after this long and the browser reconnects, so closed tabs free their threads
+    'CHORE_EVENTS_MAX_SECONDS=' + os.environ.get('CHORE_EVENTS_MAX_SECONDS', '300'),
+]
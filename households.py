@@ -0,0 +1,139 @@
+"""
+Households: one chore chart per family, each in its own data file.
+
+Every household gets its own shard (`<households dir>/<id>.json`, or `.db`
+for SQLite), with its own journal, lock file and in-memory cache, so a
+completion in one household never takes another household's lock or rewrites
+its file. Households are opened on first use and the least recently used
+ones are closed once more than `capacity` are open, so memory stays bounded
+however many households there are.
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from chore_events import ChoreEvents
+from chore_scheduler import RolloverScheduler
+from chore_store import open_store
+from page_cache import PageCache
+from points_ledger import PointsLedger
+
+# Household ids end up in file names and URLs, so keep them to lowercase slugs
+HOUSEHOLD_ID = re.compile(r'^[a-z0-9][a-z0-9_-]{0,63}$')
+
+
+class Household:
+    """Everything that serves one chore chart: its store, scheduler, caches and event streams."""
+
+    def __init__(self, household_id, store):
+        self.id = household_id # None for the single-chart deployment at the top-level routes
+        self.store = store
+        self.schedule = RolloverScheduler(store)
+        self.page_cache = PageCache()
+        self.live_updates = ChoreEvents(self.schedule)
+        self.ledger = PointsLedger(store)
+        self.schedule.on_rollover(self.changed)
+        self.schedule.on_rollover(self.close_ledger_periods)
+
+    def changed(self, snapshot=None, kinds=()):
+        """Drops cached pages and wakes live-update streams after a completion or a rollover."""
+        self.page_cache.clear()
+        self.live_updates.notify()
+
+    def close_ledger_periods(self, snapshot, kinds):
+        self.ledger.roll_over(snapshot.periods)
+
+    def invalidate(self):
+        """Forgets everything cached in memory, so the next request re-reads the data file."""
+        self.store.invalidate()
+        self.schedule.invalidate()
+        self.page_cache.clear()
+
+    def close(self):
+        self.schedule.stop()
+        self.store.close()
+
+
+class HouseholdRegistry:
+    """
+    Lazily opened households, kept in LRU order. No background threads are
+    started per household: RolloverScheduler.snapshot() rolls a household over
+    on its next request, and its open /events streams poll for that anyway.
+    """
+
+    def __init__(self, directory, extension='.json', capacity=64, default_factory=list):
+        self.directory = directory
+        self.extension = extension # '.json', or '.db' for SQLite shards
+        self.capacity = capacity
+        self.default_factory = default_factory
+        self.evictions = 0
+        self._open = OrderedDict() # household id -> Household, least recently used first
+        self._lock = threading.Lock()
+
+    def path(self, household_id):
+        """The data file for a household. Raises KeyError for ids that aren't valid slugs."""
+        if not HOUSEHOLD_ID.match(household_id):
+            raise KeyError(household_id)
+        return os.path.join(self.directory, household_id + self.extension)
+
+    def get(self, household_id):
+        """Returns the household, opening its store on first use. KeyError if it doesn't exist."""
+        with self._lock:
+            household = self._open.get(household_id)
+            if household is not None:
+                self._open.move_to_end(household_id)
+                return household
+        path = self.path(household_id)
+        if not os.path.exists(path):
+            raise KeyError(household_id)
+        # Opened outside the lock, so a slow disk for one household doesn't stall the others
+        household = Household(household_id, open_store(path))
+        with self._lock:
+            existing = self._open.get(household_id)
+            if existing is not None: # Another thread opened it first
+                household.close()
+                self._open.move_to_end(household_id)
+                return existing
+            self._open[household_id] = household
+            evicted = []
+            while len(self._open) > self.capacity:
+                evicted.append(self._open.popitem(last=False)[1])
+        for old in evicted:
+            old.close()
+            self.evictions += 1
+        return household
+
+    def create(self, household_id, chores=None):
+        """
+        Creates a household's data file, starting from `chores` or the default
+        chores. Raises KeyError for an invalid id and ValueError if it exists.
+        """
+        path = self.path(household_id)
+        if os.path.exists(path):
+            raise ValueError(f"Household {household_id!r} already exists")
+        os.makedirs(self.directory, exist_ok=True)
+        store = open_store(path)
+        try:
+            store.save(self.default_factory() if chores is None else chores)
+        finally:
+            store.close()
+        return self.get(household_id)
+
+    def __len__(self):
+        return len(self._open)
+
+    def ids(self):
+        """Ids of every household with a data file, open or not."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-len(self.extension)] for name in names
+                      if name.endswith(self.extension) and HOUSEHOLD_ID.match(name[:-len(self.extension)]))
+
+    def close(self):
+        with self._lock:
+            households, self._open = list(self._open.values()), OrderedDict()
+        for household in households:
+            household.close()
@@ -0,0 +1,143 @@
+"""
+In-process metrics, exposed in the Prometheus text format at /metrics.
+
+Three kinds of numbers are kept:
+
+- request latency per route (a histogram, recorded by flask_app/asgi_app),
+- time spent in each stage of serving a chart: `load` (reading and parsing
+  the data file or database), `status` (computing statuses and points),
+  `render` (template or JSON) and `persist` (writing completions or chores),
+- counters for cache lookups (hit/miss per cache) and file/database writes.
+
+Everything is a plain dict behind a lock, so recording costs a few hundred
+nanoseconds and nothing needs to be installed. Each gunicorn worker keeps its
+own numbers; Prometheus scrapes whichever worker answers, so run one worker
+(or scrape each one) when you need exact totals.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds; covers a cached page (~0.1 ms) up to a 1M-chore save (tens of seconds)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+
+
+class Histogram:
+    """Observations bucketed by upper bound, per label set."""
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {} # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels):
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        names = self.labelnames + ('le',)
+        with self._lock:
+            series = sorted((labels, (list(counts), total, count))
+                            for labels, (counts, total, count) in self._series.items())
+        for labels, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket
+                yield f"{self.name}_bucket{format_labels(names, labels + (bound,))} {cumulative}"
+            yield f"{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(total)}"
+            yield f"{self.name}_count{format_labels(self.labelnames, labels)} {count}"
+
+
+REQUEST_SECONDS = Histogram(
+    'chore_request_seconds', "Time to handle a request, by route and method", ('route', 'method'))
+STAGE_SECONDS = Histogram(
+    'chore_stage_seconds', "Time spent per stage: load, status, render, persist", ('stage',))
+CACHE_LOOKUPS = Counter(
+    'chore_cache_lookups_total', "Cache lookups by cache and result (hit or miss)", ('cache', 'result'))
+WRITES = Counter(
+    'chore_writes_total', "Writes to the data files or database, by kind", ('kind',))
+
+METRICS = [REQUEST_SECONDS, STAGE_SECONDS, CACHE_LOOKUPS, WRITES]
+
+
+@contextmanager
+def stage(name):
+    """Times the block into chore_stage_seconds{stage=name}."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, name)
+
+
+def cache_lookup(cache, hit):
+    CACHE_LOOKUPS.inc(cache, 'hit' if hit else 'miss')
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
@@ -0,0 +1,43 @@
+"""
+Cache of rendered pages, served with strong ETags so polling browsers get 304s.
+"""
+import hashlib
+import threading
+
+from metrics import cache_lookup
+
+
+class PageCache:
+    """
+    Keeps the last rendered body of each page together with the key it was
+    rendered for (data version plus current period). A page is re-rendered
+    only when its key changes, i.e. a chore was completed or a day rolled over.
+    """
+
+    def __init__(self):
+        self._pages = {} # page name -> (key, body, etag)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, page, key):
+        """Returns (body, etag) if `page` was rendered for `key`, else None."""
+        entry = self._pages.get(page)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            cache_lookup('page', True)
+            return entry[1], entry[2]
+        self.misses += 1
+        cache_lookup('page', False)
+        return None
+
+    def put(self, page, key, body):
+        """Stores a freshly rendered body (bytes) and returns (body, etag)."""
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        with self._lock:
+            self._pages[page] = (key, body, etag)
+        return body, etag
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
@@ -0,0 +1,132 @@
+"""
+Running point totals per day, ISO week and month.
+
+Every completion earns its chore's value. Instead of re-walking the chores
+(which only remember their latest completion), PointsLedger reads each
+completion from the store once, through ChoreStore.completions_since(), and
+adds its value to three dicts. "Points this week" is then a dict lookup, and
+an N-period trend is N lookups, however long the history gets.
+
+The ledger is derived data: rebuild() or verify() recompute it from the full
+completion history.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from chore_status import PeriodBoundaries
+
+PERIODS = ('day', 'week', 'month')
+
+
+def period_keys(moment):
+    """The (day, ISO week, month) buckets a completion falls into."""
+    day = moment.date() if isinstance(moment, datetime) else moment
+    return day, day.isocalendar()[:2], (day.year, day.month)
+
+
+def bucket_label(period, bucket):
+    """'2025-01-06', '2025-W02' or '2025-01'."""
+    if period == 'day':
+        return bucket.isoformat()
+    if period == 'week':
+        return f"{bucket[0]}-W{bucket[1]:02d}"
+    return f"{bucket[0]}-{bucket[1]:02d}"
+
+
+class PointsLedger:
+    """Per-period point aggregates for one store, kept up to date incrementally."""
+
+    def __init__(self, store, clock=datetime.now):
+        self.store = store
+        self.clock = clock
+        self.totals = {period: {} for period in PERIODS} # period -> {bucket: points}
+        self.completions = 0
+        self.current = None # (day, week, month) buckets of the open periods; see roll_over()
+        self._values = {} # chore name -> points
+        self._values_loaded = False # Whether _values was reloaded during the current update()
+        self._cursor = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+    def add(self, name, completed_at):
+        """Credits one completion to its day, week and month. O(1)."""
+        value = self._values.get(name)
+        if value is None:
+            if self._values_loaded:
+                return # Not in the table we just loaded: the chore has since been deleted
+            # New or renamed chore: refresh the value table, at most once per update()
+            self._values = {chore.name: chore.value for chore in self.store.load()}
+            self._values_loaded = True
+            value = self._values.get(name)
+            if value is None:
+                return
+        for totals, bucket in zip(self.totals.values(), period_keys(completed_at)):
+            totals[bucket] = totals.get(bucket, 0) + value
+        self.completions += 1
+
+    def update(self):
+        """
+        Applies completions written since the last call, by this process or
+        others. Costs one store.refresh() when nothing changed.
+        """
+        version = self.store.refresh()
+        if version == self._version:
+            return
+        with self._lock:
+            events, cursor = self.store.completions_since(self._cursor)
+            self._values_loaded = False
+            for name, completed_at in events:
+                self.add(name, completed_at)
+            self._cursor = cursor
+            self._version = version
+
+    def roll_over(self, periods=None):
+        """
+        Closes the expired day/week/month and opens the current ones; hook it
+        to RolloverScheduler.on_rollover so reads never have to work out the
+        period themselves.
+        """
+        periods = periods or PeriodBoundaries(self.clock())
+        self.current = period_keys(periods.today)
+
+    def rebuild(self):
+        """Recomputes every aggregate from the store's full completion history."""
+        with self._lock:
+            self.totals = {period: {} for period in PERIODS}
+            self.completions = 0
+            self._values = {chore.name: chore.value for chore in self.store.load()}
+            self._cursor = 0
+            self._version = None
+        self.update()
+        return self
+
+    def verify(self):
+        """True if the incremental totals match a fresh rebuild from history."""
+        self.update()
+        return PointsLedger(self.store).rebuild().totals == self.totals
+
+    def points(self, period):
+        """Points earned so far in the current day, week or month."""
+        self.update()
+        if self.current is None:
+            self.roll_over()
+        return self.totals[period].get(self.current[PERIODS.index(period)], 0)
+
+    def trend(self, period, count):
+        """[(bucket, points)] for the last `count` days, weeks or months, oldest first."""
+        self.update()
+        if self.current is None:
+            self.roll_over()
+        day = self.current[0]
+        buckets = []
+        for back in range(count):
+            if period == 'day':
+                bucket = day - timedelta(days=back)
+            elif period == 'week':
+                bucket = (day - timedelta(weeks=back)).isocalendar()[:2]
+            else:
+                year, month = divmod(day.year * 12 + day.month - 1 - back, 12)
+                bucket = (year, month + 1)
+            buckets.append(bucket)
+        totals = self.totals[period]
+        return [(bucket, totals.get(bucket, 0)) for bucket in reversed(buckets)]
@@ -0,0 +1,39 @@
+"""
+Shared setup for the tests. Run from the repository root with
+`python -m pytest tests`.
+"""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chore_model import Chore
+from chore_sqlite import SqliteChoreStore
+from chore_store import JsonChoreStore
+
+NOW = datetime(2025, 6, 11, 18, 0) # A Wednesday in mid-June, well away from any year boundary
+
+
+def two_chores():
+    return [Chore("Make Bed", 10, "daily"), Chore("Mow Lawn", 100, "ad_hoc")]
+
+
+@pytest.fixture
+def json_store(tmp_path):
+    """A JSON store in tmp_path holding two_chores(); closed after the test."""
+    store = JsonChoreStore(str(tmp_path / 'chore_data.json'))
+    store.save(two_chores())
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    """A SQLite store in tmp_path holding two_chores(); closed after the test."""
+    store = SqliteChoreStore(str(tmp_path / 'chores.db'))
+    store.save(two_chores())
+    yield store
+    store.close()
@@ -0,0 +1,27 @@
+"""
+PointsLedger: incremental totals from the completion history.
+
+Run from the repository root with `python -m pytest tests`.
+"""
+from datetime import timedelta
+
+from chore_model import Chore
+from conftest import NOW
+from points_ledger import PointsLedger
+
+
+def test_deleted_chore_history_loads_the_chores_once(json_store):
+    store = json_store
+    store.record_completions([("Mow Lawn", NOW - timedelta(minutes=i)) for i in range(500)])
+    store.record_completion("Make Bed", NOW)
+    store.save([Chore("Make Bed", 10, "daily")]) # Mow Lawn is deleted, its history stays
+
+    loads = []
+    load = store.load
+    store.load = lambda: loads.append(1) or load()
+    ledger = PointsLedger(store, clock=lambda: NOW)
+    ledger.update()
+    assert len(loads) == 1
+    assert ledger.completions == 1
+    assert ledger.points('day') == 10
+    assert ledger.verify()
@@ -0,0 +1,58 @@
+"""
+RolloverScheduler driven by a fake clock across day, week, month and
+bi-weekly boundaries.
+
+Run from the repository root with `python -m pytest tests`.
+"""
+from datetime import datetime
+
+from chore_model import Chore
+from chore_scheduler import RolloverScheduler
+
+
+def test_tick_rolls_over_at_each_boundary(json_store):
+    store = json_store
+    store.save([
+        Chore("Make Bed", 10, "daily", datetime(2025, 1, 31, 7, 0)),
+        Chore("Vacuum", 40, "weekly", datetime(2025, 1, 29, 18, 0)), # Wednesday
+        Chore("Wash Car", 60, "bi-weekly", datetime(2025, 1, 20, 10, 0)), # Counts through Feb 3
+        Chore("Mow Lawn", 100, "ad_hoc", datetime(2025, 1, 10, 16, 0)),
+    ])
+    now = [datetime(2025, 1, 31, 20, 0)] # Friday
+    schedule = RolloverScheduler(store, clock=lambda: now[0])
+    rolled = []
+    schedule.on_rollover(lambda snapshot, kinds: rolled.append(kinds))
+
+    snapshot, kinds = schedule.tick()
+    assert kinds == [] and snapshot.points == 210
+
+    now[0] = datetime(2025, 1, 31, 23, 59)
+    assert schedule.tick() == (snapshot, [])
+
+    # (moment, kinds that roll over, points afterwards)
+    steps = [
+        (datetime(2025, 2, 1, 0, 0), ['daily', 'monthly'], 100), # Make Bed and Mow Lawn drop out
+        (datetime(2025, 2, 2, 0, 0), ['daily'], 100),
+        (datetime(2025, 2, 3, 0, 0), ['daily', 'weekly'], 60), # Monday
+        (datetime(2025, 2, 4, 0, 0), ['daily', 'bi-weekly'], 0), # 14 days after Jan 20
+    ]
+    for moment, expected_kinds, expected_points in steps:
+        now[0] = moment
+        snapshot, kinds = schedule.tick()
+        assert kinds == expected_kinds, moment
+        assert snapshot.points == expected_points, moment
+        assert snapshot.periods.now == moment
+
+    assert rolled == [kinds for _, kinds, _ in steps]
+    assert schedule.rollovers == len(steps)
+
+
+def test_snapshot_rolls_over_without_the_thread(json_store):
+    store = json_store
+    store.save([Chore("Make Bed", 10, "daily", datetime(2025, 1, 5, 7, 0))])
+    now = [datetime(2025, 1, 5, 23, 59)]
+    schedule = RolloverScheduler(store, clock=lambda: now[0])
+    assert schedule.snapshot().points == 10
+    now[0] = datetime(2025, 1, 6, 0, 0)
+    assert schedule.snapshot().points == 0
+    assert schedule.rollovers == 1
@@ -0,0 +1,105 @@
+"""
+SQLite backend: chores are matched by id when the list is saved, and two
+connections writing at once don't undo each other.
+
+Run from the repository root with `python -m pytest tests`.
+"""
+import sqlite3
+
+from chore_model import Chore
+from chore_sqlite import SqliteChoreStore
+from chore_status import PeriodBoundaries
+from conftest import NOW
+
+
+def test_renaming_a_chore_keeps_its_id_and_history(sqlite_store):
+    store = sqlite_store
+    store.record_completion("Make Bed", NOW)
+    chores = store.load()
+    chores[0].name = "Make The Bed"
+    store.save(chores)
+    assert [(chore.id, chore.name) for chore in store.load()] == [("make-bed", "Make The Bed"), ("mow-lawn", "Mow Lawn")]
+    assert store.completions() == [("Make The Bed", NOW)]
+
+
+def test_swapping_two_names(sqlite_store):
+    store = sqlite_store
+    store.record_completion("Make Bed", NOW)
+    chores = store.load()
+    chores[0].name, chores[1].name = chores[1].name, chores[0].name
+    store.save(chores)
+    assert [(chore.id, chore.name) for chore in store.load()] == [("make-bed", "Mow Lawn"), ("mow-lawn", "Make Bed")]
+    assert store.completions() == [("Mow Lawn", NOW)]
+
+
+def test_save_upgrades_rows_from_before_ids(sqlite_store):
+    store = sqlite_store
+    store.record_completion("Make Bed", NOW)
+    store.close()
+    conn = sqlite3.connect(store.path)
+    conn.execute("UPDATE chores SET slug = NULL")
+    conn.commit()
+    conn.close()
+
+    upgraded = SqliteChoreStore(store.path)
+    chores = upgraded.load()
+    assert [chore.id for chore in chores] == ["make-bed", "mow-lawn"] # Derived until saved
+    upgraded.save(chores[:1])
+    assert [chore.id for chore in upgraded.load()] == ["make-bed"]
+    assert upgraded.completions() == [("Make Bed", NOW)]
+    upgraded.close()
+
+
+def test_saving_a_stale_list_keeps_newer_completions(sqlite_store):
+    other = SqliteChoreStore(sqlite_store.path) # Another process with the same chart
+    stale = other.load()
+    sqlite_store.record_completion("Make Bed", NOW)
+
+    stale.append(Chore("Water Plants", 5, "daily"))
+    other.save(stale)
+    assert [chore.last_completed for chore in other.load()] == [NOW, None, None]
+    assert [chore.last_completed for chore in sqlite_store.load()] == [NOW, None, None]
+    assert other.completions() == [("Make Bed", NOW)]
+    other.close()
+
+
+def test_skip_if_done_is_checked_inside_the_transaction(sqlite_store):
+    other = SqliteChoreStore(sqlite_store.path)
+    other.load() # Cached before the first completion
+    periods = PeriodBoundaries(NOW)
+    assert sqlite_store.record_completions([("Make Bed", NOW)], skip_if_done=periods) == 1
+
+    skipped = []
+    events = [("Make Bed", NOW), ("Make Bed", NOW), ("Mow Lawn", NOW)]
+    assert other.record_completions(events, skip_if_done=periods, skipped=skipped) == 1
+    assert skipped == ["Make Bed", "Make Bed"]
+    assert [name for name, _ in sqlite_store.completions()] == ["Make Bed", "Mow Lawn"]
+    other.close()
+
+
+def test_update_chores_edits_the_list_as_stored(sqlite_store):
+    other = SqliteChoreStore(sqlite_store.path)
+    other.load() # Cached before the first store adds a chore
+    sqlite_store.update_chores(lambda chores: chores.append(Chore("Water Plants", 5, "daily")))
+    other.update_chores(lambda chores: chores.append(Chore("Feed Cat", 5, "daily")))
+    assert [chore.name for chore in sqlite_store.load()] == ["Make Bed", "Mow Lawn", "Water Plants", "Feed Cat"]
+    other.close()
+
+
+def test_who_completed_a_chore_is_kept_in_the_history(sqlite_store):
+    sqlite_store.record_completions([("Make Bed", NOW, "Sam"), ("Mow Lawn", NOW)])
+    assert list(sqlite_store.iter_completions(with_by=True)) == [("Make Bed", NOW, "Sam"), ("Mow Lawn", NOW, None)]
+    assert sqlite_store.completions() == [("Make Bed", NOW), ("Mow Lawn", NOW)]
+
+
+def test_older_databases_get_the_done_by_column(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.executescript("CREATE TABLE completions (id INTEGER PRIMARY KEY, chore_id INTEGER NOT NULL,"
+                       " completed_at TEXT NOT NULL);")
+    conn.close()
+    store = SqliteChoreStore(path)
+    store.save([Chore("Make Bed", 10, "daily")])
+    store.record_completion("Make Bed", NOW, by="Sam")
+    assert list(store.iter_completions(with_by=True)) == [("Make Bed", NOW, "Sam")]
+    store.close()
@@ -0,0 +1,44 @@
+"""
+Status engine: period boundaries around New Year, the 14-day window and month ends.
+
+Run from the repository root with `python -m pytest tests`.
+"""
+from datetime import datetime, timedelta
+
+from chore_model import Chore
+from chore_status import DONE, NOT_RECURRING, PENDING, PeriodBoundaries, chore_status, evaluate
+
+
+def status(frequency, completed_at, now):
+    return chore_status(Chore("Chore", 10, frequency, completed_at), PeriodBoundaries(now))
+
+
+def test_weekly_chore_done_in_the_iso_week_that_spans_new_year():
+    # 2024-12-30 (Monday) is in ISO week 1 of 2025
+    assert status("weekly", datetime(2024, 12, 30, 18, 0), datetime(2025, 1, 2, 9, 0)) == DONE
+    assert status("weekly", datetime(2024, 12, 30, 0, 0), datetime(2025, 1, 5, 23, 59)) == DONE
+
+
+def test_weekly_chore_done_last_week_is_pending():
+    assert status("weekly", datetime(2024, 12, 29, 18, 0), datetime(2025, 1, 2, 9, 0)) == PENDING # Sunday before
+    assert status("weekly", datetime(2025, 1, 5, 23, 59), datetime(2025, 1, 6, 0, 0)) == PENDING
+
+
+def test_bi_weekly_window_is_fourteen_days():
+    now = datetime(2025, 1, 2, 9, 0)
+    assert status("bi-weekly", now - timedelta(days=14), now) == DONE
+    assert status("bi-weekly", datetime(2024, 12, 19, 0, 0), now) == DONE # Day 14, just after midnight
+    assert status("bi-weekly", datetime(2024, 12, 18, 23, 59), now) == PENDING # Day 15
+    assert status("bi-weekly", None, now) == PENDING
+
+
+def test_ad_hoc_points_count_until_the_month_ends():
+    chores = [Chore("Mow Lawn", 100, "ad_hoc", datetime(2025, 1, 1, 0, 0)),
+              Chore("Wash Car", 80, "ad_hoc", datetime(2025, 1, 31, 23, 59))]
+    assert evaluate(chores, datetime(2025, 1, 31, 23, 59, 59)) == ([NOT_RECURRING, NOT_RECURRING], 180)
+    assert evaluate(chores, datetime(2025, 2, 1, 0, 0))[1] == 0
+    assert evaluate(chores, datetime(2024, 12, 31, 23, 59))[1] == 0 # Completions after `now` don't count
+    # December's boundary crosses the year
+    december = [Chore("Mow Lawn", 100, "ad_hoc", datetime(2024, 12, 31, 23, 0))]
+    assert evaluate(december, datetime(2024, 12, 31, 23, 30))[1] == 100
+    assert evaluate(december, datetime(2025, 1, 1, 0, 0))[1] == 0
@@ -0,0 +1,136 @@
+"""
+JSON store: crash and permission paths of the snapshot + journal files, and
+writers in two processes sharing them.
+
+Run from the repository root with `python -m pytest tests`.
+"""
+import os
+import stat
+import time
+
+from chore_model import Chore
+from chore_status import PeriodBoundaries
+from chore_store import JsonChoreStore
+from conftest import NOW
+
+
+def test_snapshot_keeps_its_file_mode(json_store):
+    store = json_store
+    os.chmod(store.path, 0o644)
+    store.save(store.load())
+    store.compact()
+    assert stat.S_IMODE(os.stat(store.path).st_mode) == 0o644
+
+
+def test_torn_journal_line_is_skipped_and_cut_off(json_store):
+    store = json_store
+    store.record_completion("Make Bed", NOW)
+    store.close()
+    with open(store.journal_path, 'ab') as f:
+        f.write(b'{"name":"Mow Lawn","at":17') # A writer died mid-line
+
+    reopened = JsonChoreStore(store.path)
+    assert [chore.last_completed for chore in reopened.load()] == [NOW, None]
+    reopened.record_completion("Mow Lawn", NOW)
+    assert [event for event in reopened.completions()] == [("Make Bed", NOW), ("Mow Lawn", NOW)]
+    reopened.close()
+
+
+def test_failed_batch_writes_nothing(json_store):
+    store = json_store
+    def events():
+        yield "Make Bed", NOW
+        raise RuntimeError("import failed")
+    try:
+        store.record_completions(events())
+    except RuntimeError:
+        pass
+    assert store.completions() == []
+    assert store.load()[0].last_completed is None
+
+
+def test_compaction_that_fails_before_the_replace_is_not_archived_twice(json_store, monkeypatch):
+    store = json_store
+    store.compact() # Starts a journal with a history mark
+    store.record_completions([("Make Bed", NOW), ("Mow Lawn", NOW)])
+    events, cursor = store.completions_since(0)
+    assert len(events) == 2
+
+    def no_space(source, target):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(os, 'replace', no_space)
+    try:
+        store.compact()
+    except OSError:
+        pass
+    monkeypatch.undo()
+    # The journal was archived but is still in place: nothing may count twice
+    assert len(store.completions()) == 2
+    assert store.completions_since(cursor) == ([], cursor)
+    assert len(list(store.iter_completions())) == 2
+
+    store.compact()
+    store.record_completion("Make Bed", NOW)
+    assert len(store.completions()) == 3
+    assert store.completions_since(cursor)[0] == [("Make Bed", NOW)]
+
+
+def test_saving_a_stale_list_keeps_newer_completions(json_store):
+    other = JsonChoreStore(json_store.path) # Another process with the same chart
+    stale = other.load()
+    json_store.record_completion("Make Bed", NOW)
+
+    stale.append(Chore("Water Plants", 5, "daily"))
+    other.save(stale)
+    assert [chore.last_completed for chore in other.load()] == [NOW, None, None]
+    assert [chore.last_completed for chore in json_store.load()] == [NOW, None, None]
+    assert stale[0].last_completed == NOW
+    other.close()
+
+
+def test_last_appends_are_fsynced_without_another_completion(json_store, monkeypatch):
+    synced = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, 'fsync', lambda fd: synced.append(fd) or fsync(fd))
+    json_store.fsync_interval = 0.05
+    json_store._last_fsync = time.monotonic()
+    json_store.record_completion("Make Bed", NOW) # Too soon after the last fsync: left for the timer
+    assert json_store._unsynced == 1
+    time.sleep(0.3)
+    assert json_store._unsynced == 0
+    assert synced
+
+
+def test_skip_if_done_is_checked_under_the_write_lock(json_store):
+    other = JsonChoreStore(json_store.path)
+    other.load() # Cached before the first completion
+    periods = PeriodBoundaries(NOW)
+    assert json_store.record_completions([("Make Bed", NOW)], skip_if_done=periods) == 1
+
+    skipped = []
+    events = [("Make Bed", NOW), ("Mow Lawn", NOW), ("Mow Lawn", NOW)]
+    assert other.record_completions(events, skip_if_done=periods, skipped=skipped) == 2 # Ad-hoc chores repeat
+    assert skipped == ["Make Bed"]
+    assert [name for name, _ in json_store.completions()] == ["Make Bed", "Mow Lawn", "Mow Lawn"]
+    other.close()
+
+
+def test_update_chores_edits_the_list_as_stored(json_store):
+    other = JsonChoreStore(json_store.path)
+    other.load() # Cached before the first store adds a chore
+    json_store.update_chores(lambda chores: chores.append(Chore("Water Plants", 5, "daily")))
+    assert other.update_chores(lambda chores: len(chores)) == 3
+    other.update_chores(lambda chores: chores.append(Chore("Feed Cat", 5, "daily")))
+    assert [chore.name for chore in json_store.load()] == ["Make Bed", "Mow Lawn", "Water Plants", "Feed Cat"]
+    other.close()
+
+
+def test_who_completed_a_chore_is_kept_in_the_history(json_store):
+    json_store.record_completions([("Make Bed", NOW, "Sam"), ("Mow Lawn", NOW)])
+    json_store.record_completion("Mow Lawn", NOW, by="Alex")
+    with open(json_store.journal_path, 'ab') as f:
+        f.write(b'{"name": "Make Bed", "completed_at": "2025-06-11T19:00:00"}\n') # Older item, nobody recorded
+    expected = [("Make Bed", NOW, "Sam"), ("Mow Lawn", NOW, None), ("Mow Lawn", NOW, "Alex"),
+                ("Make Bed", NOW.replace(hour=19), None)]
+    assert list(JsonChoreStore(json_store.path).iter_completions(with_by=True)) == expected
+    assert list(json_store.iter_completions()) == [event[:2] for event in expected]
@@ -0,0 +1,45 @@
+"""
+The NumPy columnar path must give exactly what chore_status.evaluate() gives.
+
+Run from the repository root with `python -m pytest tests`.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from chore_model import Chore, Frequency
+from chore_status import evaluate
+from conftest import NOW
+
+pytest.importorskip('numpy')
+
+from chore_vector import ChoreColumns
+
+
+def mixed_households(now):
+    """Every frequency, completed from 40 days before `now` to 10 days after it, or never."""
+    households = {}
+    for h, frequency in enumerate(Frequency):
+        chores = [Chore(f"Never {h}", 7, frequency)]
+        for offset in range(-40 * 24, 10 * 24, 7): # Hours, so times of day vary too
+            chores.append(Chore(f"Chore {h}/{offset}", 5 + offset % 13, frequency, now + timedelta(hours=offset)))
+        households[f"household-{h}"] = chores
+    households["empty"] = []
+    return households
+
+
+@pytest.mark.parametrize('now', [
+    datetime(2025, 1, 1, 12, 0), # In the ISO week that starts Mon 2024-12-30
+    datetime(2024, 12, 31, 23, 59), # Month and year end
+    datetime(2025, 3, 1, 0, 0), # First moment of a month
+    NOW,
+])
+def test_columns_match_evaluate(now):
+    households = mixed_households(now)
+    columns = ChoreColumns.from_households(households)
+    statuses, points = [], {}
+    for key, chores in households.items():
+        household_statuses, points[key] = evaluate(chores, now)
+        statuses.extend(household_statuses)
+    assert columns.statuses(now) == statuses
+    assert columns.household_points(now) == points